@@ -11,8 +11,12 @@ NOTE that in python there are no "private" methods and variables but it is conve
 an underscore in front to denote that those details are internal to the class.
 """
 
-from typing import List, Optional, Tuple, Union
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+import array
+import bisect
+import heapq
 import math
+import operator
 import collections
 
 
@@ -21,15 +25,509 @@ class ScoreValidationError(Exception):
     """ raised if scores do not meet requirements"""
 
 
+# the largest score a compact Scoreboard can hold in its int64 buffers
+MAX_COMPACT_SCORE = 2**63 - 1
+
+
+class _SortedScores(object): 
+    """The scores in ascending order, kept as a list of sorted buckets of about `load` 
+    scores each with a Fenwick tree over the bucket sizes. Adding, removing, indexing and 
+    ranking a score is a binary search over the buckets, a walk down the tree and an 
+    insert into one short bucket, which keeps them O(log n) in practice without sorting 
+    the whole list again. https://grantjenks.com/docs/sortedcontainers/implementation.html
+    """
+
+    def __init__(self, scores: Iterable[int]=(), load: int=1000) -> None:
+        self._load = load 
+        self._build(sorted(scores))
+
+
+    def _build(self, ordered: List[int]) -> None: 
+        """Split sorted scores into full buckets."""
+        load = self._load 
+        self._buckets = [ordered[i:i + load] for i in range(0, len(ordered), load)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(ordered)
+        self._build_tree()
+
+
+    def _build_tree(self) -> None: 
+        """Rebuild the Fenwick tree of bucket sizes in O(number of buckets)."""
+        tree = [len(bucket) for bucket in self._buckets]
+        for i in range(len(tree)):
+            parent = i | (i + 1)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree 
+
+
+    def _update_tree(self, i: int, delta: int) -> None: 
+        tree = self._tree 
+        while i < len(tree):
+            tree[i] += delta 
+            i |= i + 1
+
+
+    def _prefix(self, i: int) -> int: 
+        """The number of scores in the buckets before bucket i."""
+        total, tree = 0, self._tree 
+        while i > 0:
+            total += tree[i - 1]
+            i &= i - 1
+        return total 
+
+
+    def __len__(self) -> int: 
+        return self._len 
+
+
+    def __getitem__(self, k: int) -> int: 
+        """The score at position k in ascending order.
+
+        Raises:
+            IndexError: If k is out of range.
+        """
+        if k < 0:
+            k += self._len 
+        if not 0 <= k < self._len:
+            raise IndexError('score index out of range')
+        tree, pos, step = self._tree, 0, 1 << (len(self._tree).bit_length() - 1)
+        while step:
+            nxt = pos + step 
+            if nxt <= len(tree) and tree[nxt - 1] <= k:
+                k -= tree[nxt - 1]
+                pos = nxt 
+            step >>= 1
+        return self._buckets[pos][k]
+
+
+    def pair(self, k: int) -> Tuple[int, int]: 
+        """The scores at positions k and k + 1 in ascending order."""
+        return self[k], self[k + 1]
+
+
+    def add(self, score: int) -> None: 
+        buckets, maxes = self._buckets, self._maxes
+        if not buckets:
+            buckets.append([score])
+            maxes.append(score)
+            self._len = 1
+            self._build_tree()
+            return 
+        i = min(bisect.bisect_right(maxes, score), len(maxes) - 1)
+        bucket = buckets[i]
+        bisect.insort(bucket, score)
+        maxes[i] = bucket[-1]
+        self._len += 1
+        if len(bucket) > 2 * self._load:
+            buckets[i:i + 1] = [bucket[:self._load], bucket[self._load:]]
+            maxes[i:i + 1] = [bucket[self._load - 1], bucket[-1]]
+            self._build_tree()
+        else:
+            self._update_tree(i, 1)
+
+
+    def update(self, scores: List[int]) -> None: 
+        """Add many scores. A batch that is large compared to the container is merged by 
+        sorting everything again, which is faster then adding the scores one at a time.
+        """
+        if len(scores) * 4 < self._len:
+            for score in scores:
+                self.add(score)
+            return 
+        self._build(sorted([score for bucket in self._buckets for score in bucket] + list(scores)))
+
+
+    def remove(self, score: int) -> None: 
+        """Remove one occurence of a score.
+
+        Raises:
+            ValueError: If the score is not in the container.
+        """
+        buckets, maxes = self._buckets, self._maxes
+        i = bisect.bisect_left(maxes, score)
+        if i == len(maxes):
+            raise ValueError(f'{score} is not a score')
+        bucket = buckets[i]
+        j = bisect.bisect_left(bucket, score)
+        if bucket[j] != score:
+            raise ValueError(f'{score} is not a score')
+        del bucket[j]
+        self._len -= 1
+        if bucket:
+            maxes[i] = bucket[-1]
+            self._update_tree(i, -1)
+        else:
+            del buckets[i], maxes[i]
+            self._build_tree()
+
+
+    def bisect_left(self, score: int) -> int: 
+        """The number of scores less then score."""
+        i = bisect.bisect_left(self._maxes, score)
+        if i == len(self._maxes):
+            return self._len 
+        return self._prefix(i) + bisect.bisect_left(self._buckets[i], score)
+
+
+    def bisect_right(self, score: int) -> int: 
+        """The number of scores less then or equal to score."""
+        i = bisect.bisect_right(self._maxes, score)
+        if i == len(self._maxes):
+            return self._len 
+        return self._prefix(i) + bisect.bisect_right(self._buckets[i], score)
+
+
+class _FrequencyIndex(object): 
+    """The number of occurences of every score, with the scores grouped into one bucket per 
+    count. The non empty counts form a doubly linked list around a sentinel count of 0 so 
+    moving a score up or down one count, finding the highest count and walking the counts 
+    from the top are all O(1) per step. 
+
+    Scores with the same count are ordered by the stack position of their first occurence, 
+    which is the order `collections.Counter.most_common` breaks ties in, so the order does 
+    not depend on how the scores were pushed. Each bucket is a sorted list of those 
+    positions and the scores are read back from the stack.
+    """
+
+    def __init__(self, stack: Sequence[int]) -> None:
+        self._stack = stack 
+        self._build()
+
+
+    def _build(self) -> None: 
+        """Count the stack and link the counts in ascending order."""
+        counts, first = collections.Counter(self._stack), {}
+        for pos, score in enumerate(self._stack):
+            first.setdefault(score, pos)
+        self._counts, self._first = counts, first 
+        self._buckets = collections.defaultdict(list)
+        for score, count in counts.items(): # in order of first occurence
+            self._buckets[count].append(first[score])
+        self._higher, self._lower = {0: 0}, {0: 0}
+        for count in sorted(self._buckets):
+            self._link(count, self._lower[0])
+
+
+    def _link(self, count: int, below: int) -> None: 
+        """Insert an empty count into the list right above the count below."""
+        above = self._higher[below]
+        self._higher[below], self._lower[count] = count, below 
+        self._higher[count], self._lower[above] = above, count 
+
+
+    def _unlink(self, count: int) -> None: 
+        below, above = self._lower.pop(count), self._higher.pop(count)
+        self._higher[below], self._lower[above] = above, below 
+        del self._buckets[count]
+
+
+    def add(self, score: int, pos: int) -> None: 
+        """Count a score that was pushed to position pos of the stack."""
+        count = self._counts[score]
+        self._counts[score] = count + 1
+        if not count:
+            self._first[score] = pos 
+        first = self._first[score]
+        if count + 1 not in self._buckets:
+            self._link(count + 1, count)
+        bisect.insort(self._buckets[count + 1], first)
+        if count: 
+            self._discard(first, count)
+
+
+    def update(self, start: int) -> None: 
+        """Count the scores pushed to the stack from position start on. A batch that is large 
+        compared to the stack is counted by rebuilding from the stack, which gives the same 
+        buckets as adding the scores one at a time."""
+        if (len(self._stack) - start) * 4 < len(self._stack):
+            for pos in range(start, len(self._stack)):
+                self.add(self._stack[pos], pos)
+            return 
+        self._build()
+
+
+    def remove(self, score: int) -> None: 
+        """Uncount a score that was popped from the stack."""
+        count, first = self._counts[score], self._first[score]
+        if count > 1:
+            self._counts[score] = count - 1
+            if count - 1 not in self._buckets:
+                self._link(count - 1, self._lower[count])
+            bisect.insort(self._buckets[count - 1], first)
+        else:
+            del self._counts[score], self._first[score]
+        self._discard(first, count)
+
+
+    def _discard(self, first: int, count: int) -> None: 
+        bucket = self._buckets[count]
+        del bucket[bisect.bisect_left(bucket, first)]
+        if not bucket:
+            self._unlink(count)
+
+
+    def most_common(self, k: int) -> List[Tuple[int, int]]: 
+        """The k most frequent scores and their counts, walking down from the highest count."""
+        result, count, stack = [], self._lower[0], self._stack 
+        while count and len(result) < k:
+            for first in self._buckets[count]:
+                result.append((stack[first], count))
+                if len(result) == k:
+                    break 
+            count = self._lower[count]
+        return result 
+
+
+class _RangeIndex(object): 
+    """A max and a min segment tree over the positions of the score stack. A threshold 
+    query walks down from the root and skips every subtree whose max (or min) cannot pass 
+    the threshold, so it visits O(log n) nodes per score it finds and returns the scores 
+    in the order they were pushed. https://cp-algorithms.com/data_structures/segment_tree.html
+    """
+
+    def __init__(self, scores: Iterable[int]=()) -> None:
+        scores = list(scores)
+        self._build(scores, len(scores))
+
+
+    def _build(self, scores: List[int], capacity: int) -> None: 
+        """Build both trees in O(capacity) with room for at least capacity scores."""
+        cap = 1
+        while cap < capacity:
+            cap *= 2
+        maxes, mins = [-math.inf] * (2 * cap), [math.inf] * (2 * cap)
+        maxes[cap:cap + len(scores)] = scores 
+        mins[cap:cap + len(scores)] = scores 
+        for node in range(cap - 1, 0, -1):
+            left, right = 2 * node, 2 * node + 1
+            maxes[node] = maxes[left] if maxes[left] > maxes[right] else maxes[right]
+            mins[node] = mins[left] if mins[left] < mins[right] else mins[right]
+        self._cap, self._len, self._maxes, self._mins = cap, len(scores), maxes, mins 
+
+
+    def _set(self, pos: int, high: float, low: float) -> None: 
+        maxes, mins = self._maxes, self._mins
+        node = self._cap + pos 
+        maxes[node], mins[node] = high, low 
+        node //= 2
+        while node:
+            left, right = 2 * node, 2 * node + 1
+            maxes[node] = maxes[left] if maxes[left] > maxes[right] else maxes[right]
+            mins[node] = mins[left] if mins[left] < mins[right] else mins[right]
+            node //= 2
+
+
+    def _scores(self) -> List[int]: 
+        return self._maxes[self._cap:self._cap + self._len]
+
+
+    def extend(self, scores: List[int]) -> None: 
+        if self._len + len(scores) > self._cap:
+            self._build(self._scores() + list(scores), 2 * (self._len + len(scores)))
+            return 
+        for score in scores:
+            self._set(self._len, score, score)
+            self._len += 1
+
+
+    def pop(self) -> None: 
+        self._len -= 1
+        self._set(self._len, -math.inf, math.inf)
+
+
+    def greater_than(self, value: int) -> List[int]: 
+        return self._report(self._maxes, operator.gt, value)
+
+
+    def less_than(self, value: int) -> List[int]: 
+        return self._report(self._mins, operator.lt, value)
+
+
+    def _report(self, tree: List[float], passes: Callable[[float, int], bool], value: int) -> List[int]: 
+        """Collect the leaves that pass the threshold from left to right."""
+        found, stack, cap = [], [1], self._cap 
+        while stack:
+            node = stack.pop()
+            if not passes(tree[node], value):
+                continue 
+            if node >= cap:
+                found.append(tree[node])
+            else:
+                stack.append(2 * node + 1)
+                stack.append(2 * node)
+        return found 
+
+
+class _BufferScan(object): 
+    """Stands in for the sorted, frequency and range indexes of a compact Scoreboard. It keeps 
+    nothing but a reference to the score buffer and answers every query by scanning it the 
+    way the plain list methods do, so the buffer stays the only per score cost.
+    """
+
+    def __init__(self, stack: Sequence[int]) -> None:
+        self._stack = stack 
+
+
+    def add(self, *args: int) -> None: 
+        """Nothing to update, the queries read the buffer."""
+
+
+    update = extend = remove = add 
+
+
+    def pop(self) -> None: 
+        """Nothing to update, the queries read the buffer."""
+
+
+    def __len__(self) -> int: 
+        return len(self._stack)
+
+
+    def __getitem__(self, k: int) -> int: 
+        """The score at position k in ascending order. The lowest and highest scores are 
+        found with one scan, any other position sorts a copy of the buffer.
+
+        Raises:
+            IndexError: If k is out of range.
+        """
+        n = len(self._stack)
+        if k < 0:
+            k += n 
+        if not 0 <= k < n:
+            raise IndexError('score index out of range')
+        if k == 0:
+            return min(self._stack)
+        if k == n - 1:
+            return max(self._stack)
+        return sorted(self._stack)[k]
+
+
+    def pair(self, k: int) -> Tuple[int, int]: 
+        """The scores at positions k and k + 1 in ascending order, with at most one sort of 
+        the buffer. A pair at either end is found with a partial scan instead.
+
+        Raises:
+            IndexError: If k or k + 1 is out of range.
+        """
+        n = len(self._stack)
+        if k < 0:
+            k += n 
+        if not 0 <= k < n - 1:
+            raise IndexError('score index out of range')
+        if k == 0:
+            low, high = heapq.nsmallest(2, self._stack)
+            return low, high 
+        if k == n - 2:
+            high, low = heapq.nlargest(2, self._stack)
+            return low, high 
+        ordered = sorted(self._stack)
+        return ordered[k], ordered[k + 1]
+
+
+    def bisect_left(self, score: int) -> int: 
+        return sum(1 for s in self._stack if s < score)
+
+
+    def bisect_right(self, score: int) -> int: 
+        return sum(1 for s in self._stack if s <= score)
+
+
+    def most_common(self, k: int) -> List[Tuple[int, int]]: 
+        return collections.Counter(self._stack).most_common(k)
+
+
+    def greater_than(self, value: int) -> List[int]: 
+        return [score for score in self._stack if score > value]
+
+
+    def less_than(self, value: int) -> List[int]: 
+        return [score for score in self._stack if score < value]
+
+
 class Scoreboard(object): 
     """ A simple class that tracks scores using a stack like API. Allows the user 
     to push and pop from the end of the score list and get some basic metadata and summary 
     statistics.
+
+    The running sum and sum of squared deviations (Welford's M2) of the scores are updated 
+    on every push and pop so total, mean, variance and stddev do not have to revisit the scores. 
+    A sorted index of the scores, the count of every score and a range index over the 
+    stack are kept next to it for the order statistics, the mode and the threshold queries. 
+    A compact Scoreboard keeps only an int64 buffer and scans it for those queries instead.
     """
-    def __init__(self) -> None:
+    def __init__(self, compact: bool=False) -> None:
+        """Create an empty Scoreboard.
+
+        Args:
+            compact (bool, optional): If True the scores are stored in an int64 buffer and 
+                no indexes are kept, which costs 8 bytes per score instead of the list, the 
+                int objects and the indexes. total, mean, variance and stddev stay O(1) but 
+                the order statistics, mode and threshold queries scan the buffer in O(n). 
+                Scores above MAX_COMPACT_SCORE are rejected. Defaults to False.
+        """
+        self._compact = compact 
         self._scores = []
 
 
+    @property 
+    def _scores(self) -> List[int]: 
+        return self._stack 
+
+
+    @_scores.setter 
+    def _scores(self, scores: List[int]) -> None: 
+        """Replace all the scores and rebuild the running aggregates from them."""
+        if self._compact:
+            self._stack = array.array('q', scores)
+            self._sorted = self._frequencies = self._ranges = _BufferScan(self._stack)
+        else:
+            self._stack = scores 
+            self._sorted = _SortedScores(scores)
+            self._frequencies = _FrequencyIndex(scores)
+            self._ranges = _RangeIndex(scores)
+        self._sum = 0
+        self._m2 = 0.0
+        self._add_to_aggregates(scores, 0)
+
+
+    def _add_to_aggregates(self, scores: List[int], count: int) -> None: 
+        """Merge a batch of scores into the running aggregates. The M2 of the batch is 
+        computed around its own mean and combined with Chan's parallel update.
+        https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance#Parallel_algorithm
+
+        Args:
+            scores (List[int]): The new scores.
+            count (int): The number of scores before the batch.
+        """
+        n_batch = len(scores)
+        if n_batch == 0:
+            return 
+        batch_sum = sum(scores)
+        batch_mean = batch_sum / n_batch
+        batch_m2 = sum((score - batch_mean)**2 for score in scores)
+        if count: 
+            delta = batch_mean - self._sum / count
+            batch_m2 += delta * delta * count * n_batch / (count + n_batch)
+        self._sum += batch_sum
+        self._m2 += batch_m2
+
+
+    def _remove_from_aggregates(self, score: int, count: int) -> None: 
+        """Reverse the Welford update of the last pushed score.
+
+        Args:
+            score (int): The removed score.
+            count (int): The number of scores left after it was removed.
+        """
+        if count == 0:
+            self._sum, self._m2 = 0, 0.0
+            return 
+        old_mean = self._sum / (count + 1)
+        self._sum -= score
+        self._m2 = max(self._m2 - (score - old_mean) * (score - self._sum / count), 0.0)
+
+
     def _validate_score(self, score: int) -> int: 
         """ Validates an incoming score assuring that it is an integer and 
         that it is greater then zero
@@ -51,6 +549,8 @@ class Scoreboard(object):
                 raise TypeError(f'{type(score)} is not of type int')
             elif score < 0:
                 raise ValueError('score is cannot be negative') 
+            elif self._compact and score > MAX_COMPACT_SCORE:
+                raise ValueError(f'score cannot be greater then {MAX_COMPACT_SCORE} in a compact Scoreboard') 
             else:
                 return score 
         except (ValueError, TypeError) as err:
@@ -65,7 +565,12 @@ class Scoreboard(object):
         """
 
         # ** which internal method should this call first?
-        self._scores.append(self._validate_score(score))
+        score = self._validate_score(score)
+        self._add_to_aggregates([score], len(self._stack))
+        self._stack.append(score)
+        self._sorted.add(score)
+        self._frequencies.add(score, len(self._stack) - 1)
+        self._ranges.extend([score])
 
 
     def push_scores(self, scores: List[int]) -> None:  
@@ -75,7 +580,13 @@ class Scoreboard(object):
             scores (List[int]): A list of new scores
         """
         # ** which internal method should this use to validate incoming scores?
-        self._scores.extend([self._validate_score(score) for score in scores])
+        scores = [self._validate_score(score) for score in scores]
+        start = len(self._stack)
+        self._add_to_aggregates(scores, start)
+        self._stack.extend(scores)
+        self._sorted.update(scores)
+        self._frequencies.update(start)
+        self._ranges.extend(scores)
 
     
     def pop_score(self) -> Optional[int]:
@@ -88,9 +599,14 @@ class Scoreboard(object):
 
         # ** implement this using try-except for a specific exception type  
         try:
-            return self._scores.pop()
+            score = self._stack.pop()
         except IndexError:
             return None
+        self._remove_from_aggregates(score, len(self._stack))
+        self._sorted.remove(score)
+        self._frequencies.remove(score)
+        self._ranges.pop()
+        return score 
 
 
     def length(self) -> int:  
@@ -122,12 +638,13 @@ class Scoreboard(object):
 
 
     def total(self) -> int: 
-        """ Return the total of all scores in the list.
+        """ Return the total of all scores in the list. The total is kept up to date 
+        by push and pop.
 
         Returns:
             int: The total.
         """  
-        return sum(self._scores)
+        return self._sum 
 
 
     def greater_than(self, value: int) -> List[int]:  
@@ -140,8 +657,10 @@ class Scoreboard(object):
         Returns:
             List[int]: Values greater then target
         """
-        # ** do this in one line with a comprehension 
-        return [score for score in self._scores if score > value]
+        # when most of the scores match one pass over the stack is cheaper then the index
+        if self.count_greater_than(value) * 8 > self.length():
+            return [score for score in self._scores if score > value]
+        return self._ranges.greater_than(value)
 
 
     def less_than(self, value: int) -> List[int]: 
@@ -153,8 +672,48 @@ class Scoreboard(object):
         Returns:
             List[int]: Values less then target
         """
-        # ** do this in one line with a comprehension 
-        return [score for score in self._scores if score < value]
+        if self.count_less_than(value) * 8 > self.length():
+            return [score for score in self._scores if score < value]
+        return self._ranges.less_than(value)
+
+
+    def count_greater_than(self, value: int) -> int: 
+        """Return the number of scores that are greater then the given value.
+
+        Args:
+            value (int): The value to check against.
+
+        Returns:
+            int: The number of scores 
+        """
+        return self.length() - self._sorted.bisect_right(value)
+
+
+    def count_less_than(self, value: int) -> int: 
+        """Return the number of scores that are less then the given value.
+
+        Args:
+            value (int): The value to check against.
+
+        Returns:
+            int: The number of scores 
+        """
+        return self._sorted.bisect_left(value)
+
+
+    def count_between(self, lo: int, hi: int) -> int: 
+        """Return the number of scores between lo and hi, including both.
+
+        Args:
+            lo (int): The lowest score to count.
+            hi (int): The highest score to count.
+
+        Returns:
+            int: The number of scores, 0 if lo is greater then hi
+        """
+        if lo > hi:
+            return 0
+        return self._sorted.bisect_right(hi) - self._sorted.bisect_left(lo)
 
 
     def best(self) -> Optional[int]:  
@@ -164,11 +723,10 @@ class Scoreboard(object):
         Returns:
             Optional[int]: The highest score in the list.
         """
-        # implement this with a builtin function 
         # implmenent this with a try-except using a specific expection 
         try:
-            return max(self._scores) 
-        except ValueError: 
+            return self._sorted[-1]
+        except IndexError: 
             return None 
 
 
@@ -179,11 +737,10 @@ class Scoreboard(object):
         Returns:
             Optional[int]: The lowest score in the list 
         """
-        # implement this with a builtin function
         # implmenent this with a try-except using a specific expection 
         try:
-            return min(self._scores)
-        except ValueError:
+            return self._sorted[0]
+        except IndexError:
             return None
 
 
@@ -204,7 +761,8 @@ class Scoreboard(object):
         if n < 0:
             raise ValueError('n cannot be negative')
         else:
-            return self._scores[:n]
+            scores = self._scores[:n]
+            return scores.tolist() if self._compact else scores 
 
 
     def bottom(self, n: int) -> List[int]: 
@@ -224,7 +782,8 @@ class Scoreboard(object):
         if n < 0:
             raise ValueError('n cannot be negative')
         else: 
-            return self._scores[-n:]
+            scores = self._scores[-n:]
+            return scores.tolist() if self._compact else scores 
 
 
     def mean(self) -> Optional[float]: 
@@ -253,13 +812,15 @@ class Scoreboard(object):
 
         # ** implement this by hand without the `statistics` module
         # ** describe how you will implement the algo before writing the code.
-        sorted_scores = sorted(self._scores)
-        if self.length() == 0:
+        sorted_scores = self._sorted 
+        length = self.length()
+        if length == 0:
             return None 
-        elif self.length() % 2: 
-            return sorted_scores[math.floor(len(sorted_scores)/2)]
+        elif length % 2: 
+            return sorted_scores[length // 2]
         else: # NOTE i have included simple test to check against this arm, see below
-            return (sorted_scores[(int(len(sorted_scores)/2)-1)]+sorted_scores[int(len(sorted_scores)/2)])/2 
+            low, high = sorted_scores.pair(length // 2 - 1)
+            return (low + high) / 2 
     '''
     median: 
         1. return none if there are no scores 
@@ -267,27 +828,84 @@ class Scoreboard(object):
         EX: [1, 2, 3, 4, 5] <=> mid_idx = len(l) / 2 (round down)
         3. if the len(scores) is odd -> return the avg of the two middle nums 
         EX: [1, 2, 3, 4, 5, 6] <=> (3 + 4) / 2 => 3.5 
+        The scores are looked up by position in the sorted index instead of sorting a copy.
     ''' 
 
+    def percentile(self, p: float) -> Optional[Union[float, int]]: 
+        """Return the p-th percentile of the scores, interpolating linearly between the 
+        two closest ranks, or None if there are no scores. percentile(50) is the median.
+
+        Args:
+            p (float): The percentile between 0 and 100.
+
+        Raises:
+            ValueError: if p is not between 0 and 100
+
+        Returns:
+            Optional[Union[float, int]]: The percentile 
+        """
+        if not 0 <= p <= 100:
+            raise ValueError('p must be between 0 and 100')
+        if self.length() == 0:
+            return None 
+        pos = p / 100 * (self.length() - 1)
+        lo = math.floor(pos)
+        frac = pos - lo 
+        if frac == 0:
+            return self._sorted[lo]
+        low, high = self._sorted.pair(lo)
+        return low + (high - low) * frac 
+
+
+    def rank(self, score: int) -> int: 
+        """Return the number of scores lower then score. This is the index of the score in 
+        ascending order, or the index it would have if it was pushed.
+
+        Args:
+            score (int): The score to rank.
+
+        Returns:
+            int: The rank starting from 0 
+        """
+        return self._sorted.bisect_left(score)
+
+
     def mode(self) -> Optional[Tuple[int]]: 
         """Return the mode of the scores and the number of occurances or 
-        None if there are no scores.
+        None if there are no scores. The counts are kept up to date by push and pop.
 
         Returns:
             Optional[Tuple[int]]: Returns a tuple of the value
         """
 
         # ** implement this by hand without the `statistics` module
-        # ** use a class from the collections module to complete this instead
         # ** do not use a try-except approach to handle None cases, but instead another method on the class.
-        if len(self._scores) == 0:
+        if self.length() == 0:
             return None
-        count_container = collections.Counter(self._scores)
-        return count_container.most_common(1)[0]
+        return self._frequencies.most_common(1)[0]
+
+
+    def top_k_frequent(self, k: int) -> List[Tuple[int, int]]: 
+        """Return the k most frequent scores and their number of occurances, most frequent 
+        first. Fewer then k are returned if there are not enough distinct scores.
+
+        Args:
+            k (int): The number of scores to return 
+
+        Raises: 
+            ValueError: if k is negative 
+
+        Returns:
+            List[Tuple[int, int]]: The scores and their number of occurances 
+        """
+        if k < 0:
+            raise ValueError('k cannot be negative')
+        return self._frequencies.most_common(k)
 
         
     def variance(self, degrees_of_freedom: int=0) -> Optional[float]: 
-        """Compute the variance of the scores with degrees of freedom. 
+        """Compute the variance of the scores with degrees of freedom from the running 
+        sum of squared deviations. 
         
         Look here https://www.statisticshowto.com/probability-and-statistics/variance
 
@@ -302,7 +920,7 @@ class Scoreboard(object):
         # ** calculate this in terms of other methods in this class
         # ** implement this using a try-except for a specific exception subclass.
         try:
-            return sum( (score - self.mean())**2 for score in self._scores ) / ( self.length() - degrees_of_freedom )
+            return self._m2 / ( self.length() - degrees_of_freedom )
         except ZeroDivisionError:
             return None
 
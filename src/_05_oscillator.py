@@ -9,32 +9,155 @@ implemented in a child class via override.
 """
 
 import abc
+import array
+import asyncio
+import cmath
+import collections
+import collections.abc
+import concurrent.futures
 import math
-from typing import Dict, List, Tuple, Union
+import mmap
+import numbers
+from multiprocessing import resource_tracker, shared_memory
+import os
+import struct
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterable, Iterator, List, MutableSequence, Optional, Sequence, Tuple, Union
 import copy 
 
+try:
+    import numpy as np
+except ImportError: # numpy is optional, without it the oscillators use the pure python paths 
+    np = None 
+
 
 
 
 # a helper to scale an array between two vals
 #https://stats.stackexchange.com/questions/178626/how-to-normalize-data-between-1-and-1
-def normalize(x: List[float], a: float, b: float) -> List[float]:
+def normalize(x: List[float], a: float, b: float, 
+    bounds: Optional[Tuple[float, float]]=None) -> List[float]:
     """Scales the value x between the range [a,b]
 
     Args:
         x (List[float]): The value to be normalized
         a (float): The min value
         b (float): The max value
+        bounds (Optional[Tuple[float, float]], optional): A known (min, max) of the data. Used when 
+            x is only one chunk of a larger waveform. Defaults to None which uses the min and max of x.
 
     Returns:
         float: normalized value 
     """
     assert a < b, 'a must be less then b'
-    min_x = min(x)
-    max_x = max(x)
+    min_x, max_x = bounds if bounds is not None else (min(x), max(x))
     return [(b - a) * ( (xval-min_x ) / (max_x - min_x) ) + a for xval in x]
 
 
+class RunningBounds(object): 
+    """Tracks the min and max of all values it has been updated with so a waveform that is 
+    generated in pieces only has to be scanned once.
+    """
+
+    def __init__(self) -> None:
+        self._min = math.inf 
+        self._max = -math.inf 
+
+
+    @property 
+    def min(self) -> float: 
+        return self._min 
+
+
+    @property 
+    def max(self) -> float: 
+        return self._max 
+
+
+    @property 
+    def bounds(self) -> Tuple[float, float]: 
+        return (self._min, self._max)
+
+
+    def __bool__(self) -> bool: 
+        return self._min <= self._max
+
+
+    def update(self, values: Sequence[float]) -> 'RunningBounds':
+        """Include a block of values in the bounds.
+
+        Args:
+            values (Sequence[float]): The values.
+
+        Returns:
+            RunningBounds: self so calls can be chained.
+        """
+        if len(values) == 0:
+            return self 
+        if np is not None and isinstance(values, array.array):
+            buf = np.frombuffer(values, dtype=values.typecode)
+            lo, hi = float(buf.min()), float(buf.max())
+        else:
+            lo, hi = min(values), max(values)
+        self._min, self._max = min(self._min, lo), max(self._max, hi)
+        return self 
+
+
+def normalize_inplace(x: MutableSequence[float], a: float, b: float, 
+    bounds: Optional[Tuple[float, float]]=None) -> MutableSequence[float]:
+    """Same as `normalize` but overwrites the values of a list or float buffer instead of 
+    allocating a new list. Buffers are rescaled with numpy when it is available.
+
+    Args:
+        x (MutableSequence[float]): The values to be normalized
+        a (float): The min value
+        b (float): The max value
+        bounds (Optional[Tuple[float, float]], optional): A known (min, max) of the data. 
+            Defaults to None which uses the min and max of x.
+
+    Raises:
+        ZeroDivisionError: If the min and max are equal, like `normalize`.
+
+    Returns:
+        MutableSequence[float]: x
+    """
+    assert a < b, 'a must be less then b'
+    min_x, max_x = bounds if bounds is not None else RunningBounds().update(x).bounds
+    if max_x == min_x: # numpy would fill the buffer with nan instead of raising
+        raise ZeroDivisionError('cannot normalize values that are all equal')
+    if np is not None and isinstance(x, array.array):
+        buf = np.frombuffer(x, dtype=x.typecode)
+        buf -= min_x
+        buf /= max_x - min_x
+        buf *= b - a
+        buf += a
+    else:
+        for i, xval in enumerate(x):
+            x[i] = (b - a) * ( (xval-min_x ) / (max_x - min_x) ) + a
+    return x
+
+
+def _vectorized(x: Sequence[float], y: 'np.ndarray') -> Union[List[float], array.array]:
+    """Converts the result of a vectorized numpy calculation back into the same kind 
+    of container as the x values it was computed from.
+
+    Args:
+        x (Sequence[float]): The x values given to the calculation.
+        y (np.ndarray): The result of the calculation.
+
+    Returns:
+        Union[List[float], array.array]: A float64 buffer if x was a buffer, otherwise a list.
+    """
+    if isinstance(x, array.array):
+        buf = array.array('d')
+        buf.frombytes(y.astype(np.float64, copy=False).tobytes())
+        return buf
+    return y.tolist()
+
+
 def assure_positive(*args: Union[float, int]) -> Tuple[Union[float, int]]:
     """Assures that any inbound float or ints are returned as positive
 
@@ -46,16 +169,39 @@ def assure_positive(*args: Union[float, int]) -> Tuple[Union[float, int]]:
 
 class Point(object): 
 
+    __slots__ = ('_x', '_y')
+
     def __init__(self, x: float, y: float):
         """A container object that holds a point as a coordinate pair 
-        and allows the caller to create various python objects.
+        and allows the caller to create various python objects. Points are immutable 
+        and use slots instead of a per instance dict to keep them small.
 
         Args:
             x (float): the x coord
             y (float): the y coord
         """
-        self._x = x 
-        self._y = y 
+        object.__setattr__(self, '_x', x)
+        object.__setattr__(self, '_y', y)
+
+    def __setattr__(self, name: str, value: object) -> None: 
+        raise AttributeError('Point is immutable')
+
+    def __delattr__(self, name: str) -> None: 
+        raise AttributeError('Point is immutable')
+
+    def __eq__(self, other: object) -> bool: 
+        if not isinstance(other, Point):
+            return NotImplemented
+        return self._x == other._x and self._y == other._y
+
+    def __hash__(self) -> int: 
+        return hash((self._x, self._y))
+
+    def __repr__(self) -> str: 
+        return f'Point({self._x!r}, {self._y!r})'
+
+    def __reduce__(self) -> Tuple: 
+        return (Point, (self._x, self._y))
 
     @property 
     def x(self): 
@@ -84,6 +230,431 @@ class Point(object):
         return {'x': self._x, 'y': self._y}
 
 
+class _LazySequence(collections.abc.Sequence): 
+    """Base class for read only sequences of floats that compute their values on access. 
+    PointArray keeps these as they are instead of copying them into a buffer.
+    """
+
+
+class SamplingIndex(_LazySequence): 
+
+    def __init__(self, samples: range, sr: int):
+        """A lazy sampling index where the i-th value is samples[i] / sr, the same values 
+        that `Oscillator._calculate_sampling_index` would produce.
+
+        Args:
+            samples (range): The sample numbers.
+            sr (int): The sample rate.
+        """
+        self._samples = samples 
+        self._sr = sr 
+
+
+    def __len__(self) -> int: 
+        return len(self._samples)
+
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[float, 'SamplingIndex']: 
+        if isinstance(idx, slice):
+            return SamplingIndex(self._samples[idx], self._sr)
+        return self._samples[idx] / self._sr
+
+
+    def __iter__(self) -> Iterator[float]: 
+        return (num / self._sr for num in self._samples)
+
+
+class MappedSamples(_LazySequence): 
+
+    def __init__(self, view: memoryview, scale: float=1.0, offset: float=0.0):
+        """A read only view of samples in a memory mapped file. Values are read from the 
+        mapped pages on access as raw * scale + offset, so integer PCM can be presented as 
+        floats and normalization only changes the scale and offset.
+
+        Args:
+            view (memoryview): A memoryview cast to the sample type.
+            scale (float, optional): Multiplied with each raw value. Defaults to 1.0.
+            offset (float, optional): Added to each scaled value. Defaults to 0.0.
+        """
+        self._view = view 
+        self._scale = scale 
+        self._offset = offset 
+
+
+    def __len__(self) -> int: 
+        return len(self._view)
+
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[float, 'MappedSamples']: 
+        if isinstance(idx, slice):
+            return MappedSamples(self._view[idx], self._scale, self._offset)
+        return self._view[idx] * self._scale + self._offset
+
+
+    def __iter__(self) -> Iterator[float]: 
+        if self._scale == 1.0 and self._offset == 0.0:
+            return (float(value) for value in self._view)
+        return (value * self._scale + self._offset for value in self._view)
+
+
+    def bounds(self) -> Tuple[float, float]:
+        """Find the min and max values with one pass over the mapped pages.
+
+        Raises:
+            ValueError: If there are no samples.
+
+        Returns:
+            Tuple[float, float]: The min and max.
+        """
+        if np is not None:
+            raw = np.asarray(self._view) # handles the strides of a stepped slice
+            lo, hi = float(raw.min()), float(raw.max())
+        else:
+            lo, hi = min(self._view), max(self._view)
+        lo, hi = lo * self._scale + self._offset, hi * self._scale + self._offset
+        return (lo, hi) if lo <= hi else (hi, lo)
+
+
+    def normalized(self, a: float, b: float) -> 'MappedSamples':
+        """Return a view of the same pages scaled between the range [a, b].
+
+        Args:
+            a (float): The min value
+            b (float): The max value
+
+        Returns:
+            MappedSamples: The normalized view.
+        """
+        assert a < b, 'a must be less then b'
+        min_x, max_x = self.bounds()
+        k = (b - a) / (max_x - min_x)
+        return MappedSamples(self._view, self._scale * k, (self._offset - min_x) * k + a)
+
+
+def _map_wav(view: memoryview) -> Tuple[MappedSamples, int]:
+    """Find the data chunk of a mono WAV file and map it as samples. Only the chunk 
+    headers are read.
+
+    Args:
+        view (memoryview): A byte view of the whole file.
+
+    Raises:
+        ValueError: If the file is not a mono 16/32 bit int or 32/64 bit float WAV.
+
+    Returns:
+        Tuple[MappedSamples, int]: The samples and sample rate.
+    """
+    fmt, pos = None, 12
+    while pos + 8 <= len(view):
+        chunk_id, size = struct.unpack_from('<4sI', view, pos)
+        if chunk_id == b'fmt ':
+            fmt = struct.unpack_from('<HHIIHH', view, pos + 8)
+            if fmt[0] == 0xFFFE: # WAVE_FORMAT_EXTENSIBLE stores the real format in the sub format guid
+                fmt = struct.unpack_from('<H', view, pos + 32) + fmt[1:]
+        elif chunk_id == b'data':
+            break 
+        pos += 8 + size + size % 2
+    else:
+        raise ValueError('wav file has no data chunk')
+    if fmt is None:
+        raise ValueError('wav file has no fmt chunk')
+    tag, channels, sr, _, _, bit_depth = fmt
+    typecodes = {(1, 16): 'h', (1, 32): 'i', (3, 32): 'f', (3, 64): 'd'}
+    if channels != 1 or (tag, bit_depth) not in typecodes:
+        raise ValueError('only mono 16/32 bit int or 32/64 bit float wav files can be mapped')
+    if sys.byteorder == 'big':
+        raise ValueError('wav files can only be mapped on little endian machines')
+    typecode = typecodes[(tag, bit_depth)]
+    size = min(size, len(view) - pos - 8)
+    data = view[pos + 8:pos + 8 + size - size % (bit_depth // 8)].cast(typecode)
+    scale = 1.0 if tag == 3 else 1 / (2 ** (bit_depth - 1) - 1)
+    return MappedSamples(data, scale), sr
+
+
+class PointArray(object): 
+
+    def __init__(self, x: Sequence[float], y: Sequence[float]):
+        """A compact container that holds the x and y coords of many points in two 
+        contiguous float64 buffers. Point objects are only created when they are asked for. 
+        Lazy sequences such as MappedSamples are kept as they are.
+
+        Args:
+            x (Sequence[float]): the x coords
+            y (Sequence[float]): the y coords
+
+        Raises:
+            ValueError: If x and y are not the same length.
+        """
+        if len(x) != len(y):
+            raise ValueError('x and y must be the same length')
+        self._x = x if isinstance(x, (array.array, _LazySequence)) else array.array('d', x)
+        self._y = y if isinstance(y, (array.array, _LazySequence)) else array.array('d', y)
+
+    @property 
+    def x(self) -> Sequence[float]: 
+        return self._x 
+
+
+    @property 
+    def y(self) -> Sequence[float]: 
+        return self._y 
+
+
+    def __len__(self) -> int: 
+        return len(self._x)
+
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Point, 'PointArray']: 
+        if isinstance(idx, slice):
+            return PointArray(self._x[idx], self._y[idx])
+        return Point(self._x[idx], self._y[idx])
+
+
+    def __iter__(self) -> Iterator[Point]: 
+        return (Point(x_i, y_i) for x_i, y_i in zip(self._x, self._y))
+
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point]) -> 'PointArray':
+        """Pack a list of Points into buffers.
+
+        Args:
+            points (Iterable[Point]): The points.
+
+        Returns:
+            PointArray: The packed points.
+        """
+        x, y = array.array('d'), array.array('d')
+        for point in points:
+            x.append(point.x)
+            y.append(point.y)
+        return cls(x, y)
+
+
+    def as_tuple(self, idx: int) -> Tuple[float]: 
+        """Converts the point at idx to a tuple without creating a Point.
+
+        Args:
+            idx (int): The index.
+
+        Returns:
+            Tuple[float]: the tuple x,y
+        """
+        return (self._x[idx], self._y[idx])
+
+
+    def as_dict(self, idx: int) -> Dict[str, float]: 
+        """Converts the point at idx to dictionary format without creating a Point.
+
+        Args:
+            idx (int): The index.
+
+        Returns:
+            Dict[str, float]: A dictionary with keys x and y
+        """
+        return {'x': self._x[idx], 'y': self._y[idx]}
+
+
+    def to_objects(self) -> List[Point]: 
+        """Builds a Point for every sample in the buffers.
+
+        Returns:
+            List[Point]: A list of point objects.
+        """
+        return [Point(x_i, y_i) for x_i, y_i in zip(self._x, self._y)]
+
+
+    def to_tuples(self) -> List[Tuple[float]]: 
+        """Converts every point to a tuple.
+
+        Returns:
+            List[Tuple[float]]: A list of x,y tuples.
+        """
+        return list(zip(self._x, self._y))
+
+
+    def to_records(self) -> List[Dict[str, float]]: 
+        """Converts every point to dictionary format.
+
+        Returns:
+            List[Dict[str, float]]: A list of dicts with keys x and y
+        """
+        return [{'x': x_i, 'y': y_i} for x_i, y_i in zip(self._x, self._y)]
+
+
+
+class PointsView(_LazySequence): 
+
+    def __init__(self, points: Union[List[Point], PointArray], as_type: str='tuples'):
+        """A read only view of points that converts each point to a tuple or dict when it is 
+        accessed instead of building a full list up front. Compares equal to a list with 
+        the same items.
+
+        Args:
+            points (Union[List[Point], PointArray]): The points to view.
+            as_type (str, optional): 'tuples' or 'records'. Defaults to 'tuples'.
+        """
+        self._points = points 
+        self._as_type = as_type 
+
+
+    def __len__(self) -> int: 
+        return len(self._points)
+
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Tuple, Dict, 'PointsView']: 
+        if isinstance(idx, slice):
+            return PointsView(self._points[idx], self._as_type)
+        if isinstance(self._points, PointArray):
+            if self._as_type == 'tuples':
+                return self._points.as_tuple(idx)
+            return self._points.as_dict(idx)
+        if self._as_type == 'tuples':
+            return self._points[idx].as_tuple()
+        return self._points[idx].as_dict()
+
+
+    def __iter__(self) -> Iterator[Union[Tuple, Dict]]: 
+        if isinstance(self._points, PointArray):
+            pairs = zip(self._points.x, self._points.y)
+        else:
+            pairs = ((point.x, point.y) for point in self._points)
+        if self._as_type == 'tuples':
+            return iter(pairs)
+        return ({'x': x_i, 'y': y_i} for x_i, y_i in pairs)
+
+
+    def __eq__(self, other: object) -> bool: 
+        if not isinstance(other, (list, tuple, PointsView)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+
+    def __repr__(self) -> str: 
+        return f'PointsView({self._as_type!r}, {len(self)} points)'
+
+
+    def materialize(self) -> List[Union[Tuple, Dict]]:
+        """Convert every point and return them as a list.
+
+        Returns:
+            List[Union[Tuple, Dict]]: The list of tuples or dicts.
+        """
+        if isinstance(self._points, PointArray):
+            return self._points.to_tuples() if self._as_type == 'tuples' else self._points.to_records()
+        return list(self)
+
+
+class StageProfiler(object): 
+    """Records the wall time and allocated bytes of each stage of `Oscillator.calc` and 
+    `Oscillator.stream` per oscillator class while it is active. Use it as a context manager:
+
+    >>> with StageProfiler() as profiler: 
+    ...     WaveFactory().create(osc=Sine())
+    >>> profiler.stats(Sine)['generate_waveform']['seconds']
+
+    When no profiler is active each stage costs one extra function call and a None check. Only 
+    the thread that entered the profiler is recorded, since tracemalloc measures the whole 
+    process and stages running concurrently in other threads would be counted against each other.
+    """
+
+    def __init__(self, 
+        trace_memory: bool=True, 
+        hook: Optional[Callable[[type, str, float, int], None]]=None):
+        """Create a profiler.
+
+        Args:
+            trace_memory (bool, optional): Measure the peak bytes allocated by each stage with 
+                tracemalloc. This slows down the stages considerably. Defaults to True.
+            hook (Optional[Callable[[type, str, float, int], None]], optional): Called with the 
+                oscillator class, stage name, seconds and bytes after every stage. Defaults to None.
+        """
+        self._trace_memory = trace_memory 
+        self._hook = hook 
+        self._stats = collections.defaultdict(dict)
+        self._previous = None 
+        self._started_tracing = False
+        self._thread: Optional[int] = None 
+        self._lock = threading.Lock()
+
+
+    def __enter__(self) -> 'StageProfiler': 
+        global _profiler
+        self._previous, _profiler = _profiler, self
+        self._thread = threading.get_ident()
+        if self._trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self 
+
+
+    def __exit__(self, *exc_info: Any) -> None: 
+        global _profiler
+        _profiler = self._previous
+        self._thread = None 
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+    def record(self, osc_class: type, stage: str, func: Callable, *args: Any) -> Any:
+        """Run one stage and record its time and allocations. Stages run by any thread other 
+        than the one that entered the profiler are run without being recorded.
+
+        Args:
+            osc_class (type): The class of the oscillator running the stage.
+            stage (str): The stage name.
+            func (Callable): The stage function.
+            *args (Any): The arguments of func.
+
+        Returns:
+            Any: The result of func.
+        """
+        if threading.get_ident() != self._thread: 
+            return func(*args)
+        tracing = self._trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        result = func(*args)
+        seconds = time.perf_counter() - start
+        nbytes = tracemalloc.get_traced_memory()[1] - before if tracing else 0
+        with self._lock: 
+            totals = self._stats[osc_class].setdefault(stage, {'calls': 0, 'seconds': 0.0, 'allocated_bytes': 0})
+            totals['calls'] += 1
+            totals['seconds'] += seconds
+            totals['allocated_bytes'] += nbytes
+        if self._hook is not None:
+            self._hook(osc_class, stage, seconds, nbytes)
+        return result 
+
+
+    def stats(self, osc_class: Optional[type]=None) -> Dict:
+        """Return the aggregated stats.
+
+        Args:
+            osc_class (Optional[type], optional): Only return the stages of this class. Defaults to None.
+
+        Returns:
+            Dict: The calls, seconds and allocated_bytes of each stage, keyed by stage name for 
+                one class or by class and then stage name for all classes.
+        """
+        with self._lock: 
+            if osc_class is not None:
+                return copy.deepcopy(self._stats.get(osc_class, {}))
+            return copy.deepcopy(dict(self._stats))
+
+
+    def reset(self) -> None: 
+        """Clear the recorded stats."""
+        with self._lock: 
+            self._stats.clear()
+
+
+_profiler: Optional[StageProfiler] = None
+
+
 
 class Oscillator(abc.ABC): 
     """This is an Abstract base class. We force the developer to implement 
@@ -92,31 +663,93 @@ class Oscillator(abc.ABC):
     change the resulting data based on what type of waveform is desired.
     """
 
-    def __init__(self, sr: int=44100):
+    # True if `_generate_waveform` never leaves [-amp, amp], which lets `stream` skip the 
+    # pass that finds the bounds of the waveform when amp <= 1
+    bounded = False 
+
+    def __init__(self, sr: int=44100, compact: bool=False, precision: Optional[int]=5):
         """An oscillator that generates a waveform.
 
         Args:
             sr (int, optional): The sample rate as a positive integer. Defaults to 44100.
+            compact (bool, optional): If True the x and y data are kept in float64 buffers and 
+                `calc` returns a PointArray instead of a list of Points. Defaults to False.
+            precision (Optional[int], optional): The number of decimals the y values are rounded 
+                to. None keeps full precision and skips the rounding. Defaults to 5.
+
+        Raises:
+            ValueError: If precision is negative.
         """
         #** implement this in terms of another method in this class
         
         self._sr = self.set_samplerate(sr)
+        self._compact = compact
+        if precision is not None and precision < 0:
+            raise ValueError('precision cannot be negative')
+        self._precision = precision 
+        self._stages: Tuple['PipelineStage', ...] = ()
     
 
-    def _make_points(self, x: List[float], y: List[float]) -> List[Point]:
-        """Generate a list of Points.
+    def _make_points(self, x: List[float], y: List[float]) -> Union[List[Point], PointArray]:
+        """Generate a list of Points. In compact mode the rounded y values are 
+        packed next to x into a PointArray instead.
 
         Args:
             x (List[float]): The x data
             y (List[float]): The y data
 
         Returns:
-            List[Point]: A list of point objects.
+            Union[List[Point], PointArray]: A list of point objects or a PointArray.
         """
 
         # ** solve this in one line using a comprehension 
+        if self._precision is not None: 
+            y = self._stage('round', self._round_samples, y)
+        return self._stage('points', self._pack_points, x, y)
+
+
+    def _round_samples(self, y: List[float]) -> List[float]:
+        """Round the y values to the precision of the oscillator, with the same results as the 
+        builtin `round`. When numpy is available the whole buffer is rounded at once and only 
+        the values that land next to a tie after scaling are rounded again with `round`, since 
+        numpy rounds the scaled value rather than the exact decimal."""
+        ndigits = self._precision 
+        if np is not None and ndigits <= 22: # 10**22 is the largest exact power of ten
+            values = np.asarray(y, dtype=np.float64)
+            scale = 10.0 ** ndigits
+            scaled = values * scale
+            rounded = np.rint(scaled) / scale
+            with np.errstate(invalid='ignore'): # inf - inf for infinite samples
+                near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 2 * np.spacing(np.abs(scaled))
+            for i in np.flatnonzero(near_tie).tolist():
+                rounded[i] = round(float(values[i]), ndigits)
+            return _vectorized(array.array('d') if self._compact else [], rounded)
+        if self._compact: 
+            return array.array('d', (round(y_i, ndigits) for y_i in y))
+        return [round(y_i, ndigits) for y_i in y]
+
+
+    def _pack_points(self, x: List[float], y: List[float]) -> Union[List[Point], PointArray]:
+        """Pair up x and y as Points or as a PointArray in compact mode."""
+        if self._compact: 
+            return PointArray(x, y)
+        return [Point(x_i, y_i) for x_i, y_i in zip(x, y)]
+
+
+    def _stage(self, stage: str, func: Callable, *args: Any) -> Any:
+        """Run one stage of the pipeline through the active StageProfiler if there is one.
+
+        Args:
+            stage (str): The stage name.
+            func (Callable): The stage function.
+            *args (Any): The arguments of func.
 
-        return [Point(pair[0], pair[1]) for pair in list(zip(x, [round(y_i, 5) for y_i in y]))]
+        Returns:
+            Any: The result of func.
+        """
+        if _profiler is None:
+            return func(*args)
+        return _profiler.record(type(self), stage, func, *args)
 
 
     def _calculate_sampling_index(self, dur: float) -> List[float]:
@@ -135,10 +768,99 @@ class Oscillator(abc.ABC):
             List[float]: The sampling index 
         """
         # ** solve this in one line using a comprehension 
+        return self._sampling_range(0, int(self._sr * dur))
+
+
+    def _sampling_range(self, start: int, stop: int) -> List[float]:
+        """Calculate the sampling index for the sample numbers in [start, stop). A chunk of 
+        the index is identical to the same slice of the full `_calculate_sampling_index`.
+
+        Args:
+            start (int): The first sample number.
+            stop (int): The sample number to stop before.
 
-        return [num / self._sr for num in range(0, int(self._sr * dur))]
+        Returns:
+            List[float]: The sampling index 
+        """
+        if np is not None:
+            index = np.arange(start, stop, dtype=np.float64) / self._sr
+            return _vectorized(array.array('d') if self._compact else [], index)
+        if self._compact:
+            return array.array('d', (num / self._sr for num in range(start, stop)))
+        return [num / self._sr for num in range(start, stop)]
     
 
+    def _cache_key(self) -> Tuple:
+        """A hashable description of the oscillator config used by WaveCache. Subclasses 
+        with extra config that changes the generated waveform should extend it.
+
+        Returns:
+            Tuple: The oscillator class, sample rate, compact flag, precision and pipeline stages. 
+                The sample rate matters for oscillators nested in a Wavetable or a modulation 
+                stage, which generate at their own rate.
+        """
+        return (type(self), self._sr, self._compact, self._precision) + tuple(stage._cache_key() for stage in self._stages)
+
+
+    def pipe(self, *stages: 'PipelineStage') -> 'Oscillator':
+        """Return a copy of the oscillator with envelope or modulation stages added to the end 
+        of its generation pipeline. Phase stages like FrequencyModulation change the phase 
+        the waveform is generated at, the others scale the generated buffer.
+
+        >>> Sine().pipe(FrequencyModulation(Sine(), 5.0, 20.0), ADSR(0.01, 0.1, 0.7, 0.2))
+
+        Args:
+            *stages (PipelineStage): The stages in the order they are applied.
+
+        Returns:
+            Oscillator: The new oscillator. 
+        """
+        osc = copy.copy(self)
+        osc._stages = self._stages + stages
+        return osc 
+
+
+    def _generate(self, 
+        x: Sequence[float], 
+        freq: float, 
+        amp: float, 
+        dur: float, 
+        states: Optional[List[Dict]]=None) -> Sequence[float]:
+        """Run the phase stages, the `_generate_waveform` hook and the buffer stages for a 
+        block of the sampling index. Every stage works on the whole block at once.
+
+        Args:
+            x (Sequence[float]): The sampling index of the block.
+            freq (float): The frequency (Hz)
+            amp (float): The amplitude
+            dur (float): The duration of the whole waveform in seconds.
+            states (Optional[List[Dict]], optional): The state of each stage for one stream, see 
+                `_stage_states`. Defaults to None which starts from empty states.
+
+        Returns:
+            Sequence[float]: The y values of the block.
+        """
+        if states is None:
+            states = self._stage_states()
+        x_gen, gen_freq = x, freq
+        for stage, state in zip(self._stages, states):
+            if stage.modulates_phase:
+                x_gen, gen_freq = self._stage(stage.name, stage.phase, x, x_gen, gen_freq, self._sr, state)
+        y = self._stage('generate_waveform', self._generate_waveform, x_gen, gen_freq, amp)
+        for stage in self._stages:
+            if not stage.modulates_phase:
+                y = self._stage(stage.name, stage.apply, x, y, dur)
+        return y 
+
+
+    def _stage_states(self) -> List[Dict]:
+        """A fresh state for each pipeline stage. A stream owns its states and passes them to 
+        every block, so the stages themselves can be shared by copies of the oscillator that 
+        stream at the same time.
+        """
+        return [{} for _ in self._stages]
+
+
     @abc.abstractmethod
     def _generate_waveform(self, x: List[float],  freq: float, amp: float) -> List[float]:
         """This method generates the waveform. It is a hook that should be overridden in concrete 
@@ -171,10 +893,12 @@ class Oscillator(abc.ABC):
             return self._sr
 
 
-    def calc(self, freq: float=1.0, dur: float=1.0, amp: float=1.0) -> List[Point]:
+    def calc(self, freq: float=1.0, dur: float=1.0, amp: float=1.0) -> Union[List[Point], PointArray]:
         """Generate a waveform as a list of points. 
         
         NOTE that negative values should work as inputs and amp > 1 the waveform is normalized.
+        The y values are scanned once for their bounds and normalized in place.
+        In compact mode a PointArray is returned instead of a list.
 
         Args:
             freq (float, optional): The frequency of the waveform. Defaults to 1.0.
@@ -182,36 +906,116 @@ class Oscillator(abc.ABC):
             amp (float, optional): The amplitude of the waveform. Defaults to 1.0.
 
         Returns:
-            List[Point]: The waveform as a list of Points.
+            Union[List[Point], PointArray]: The waveform as a list of Points.
         """
         # ** this public method should be composed of other methods and module level functions.
         pos_freq, pos_dur, pos_amp = assure_positive(freq, dur, amp)
-        x = self._calculate_sampling_index(pos_dur)
-        y = self._generate_waveform(x, pos_freq, pos_amp)
-        out_of_bound_y_values = any(value > 1 for value in y)
-        if  amp > 1 or out_of_bound_y_values:
-            x = normalize(y, -1.0, 1.0)
+        x = self._stage('sampling_index', self._calculate_sampling_index, pos_dur)
+        y = self._generate(x, pos_freq, pos_amp, pos_dur)
+        bounds = self._stage('bounds', RunningBounds().update, y)
+        out_of_bound_y_values = bounds.max > 1
+        if bounds and (amp > 1 or out_of_bound_y_values):
+            y = self._stage('normalize', normalize_inplace, self._owned(x, y), -1.0, 1.0, bounds.bounds)
         return self._make_points(x, y)
 
 
-class Sine(Oscillator): 
-
-    def _generate_waveform(self, x: List[float],  freq: float, amp: float) -> List[float]:
-        """Generate the y values of a sine wave. Uses the formula found here: 
-        https://en.wikipedia.org/wiki/Sine_wave
-
-        Args:
-            x (List[float]): The x values to use for the calculation. 
-            freq (float): The frequency of the waveform.
-            amp (float): The amplitude of the waveform.
-
-        Returns:
-            List[float]: The y values of the waveform.
+    def _owned(self, x: Sequence[float], y: Sequence[float]) -> MutableSequence[float]:
+        """Return y as a container that can be changed in place. Subclasses may return the 
+        x values themselves from `_generate_waveform` so those are copied first.
         """
-        return [amp * math.sin(2 * math.pi * freq * x_i) for x_i in x]
+        if y is x or not isinstance(y, (list, array.array)):
+            return array.array('d', y) if isinstance(x, array.array) else list(y)
+        return y 
 
 
-class Triangle(Oscillator): 
+    def stream(self, 
+        freq: float=1.0, 
+        dur: float=1.0, 
+        amp: float=1.0, 
+        chunk_size: int=4096) -> Iterator[Union[List[Point], PointArray]]:
+        """Generate a waveform in blocks of chunk_size samples. Each block is computed from the 
+        absolute sample numbers so the phase carries over the chunk boundaries and the 
+        concatenated blocks are equal to the output of `calc`. 
+
+        NOTE if amp > 1, or the oscillator or one of its stages does not declare a bounded 
+        output, the waveform is generated twice, once to find its min and max and once to yield 
+        the blocks, which are normalized whenever `calc` would normalize them.
+
+        Args:
+            freq (float, optional): The frequency of the waveform. Defaults to 1.0.
+            dur (float, optional): The duration of the waveform. Defaults to 1.0.
+            amp (float, optional): The amplitude of the waveform. Defaults to 1.0.
+            chunk_size (int, optional): The number of samples per block. Defaults to 4096.
+
+        Raises:
+            ValueError: If chunk_size is less then 1 or if a block of an oscillator that declares 
+                a bounded output is out of bounds.
+
+        Yields:
+            Union[List[Point], PointArray]: The next block of the waveform.
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+        pos_freq, pos_dur, pos_amp = assure_positive(freq, dur, amp)
+        n_samples = int(self._sr * pos_dur)
+        bounds, normalize = None, False 
+        if amp > 1 or not self._bounded_output():
+            bounds = self._stream_bounds(n_samples, chunk_size, pos_freq, pos_amp, pos_dur)
+            normalize = bool(bounds) and (amp > 1 or bounds.max > 1) # the same test as calc
+        states = self._stage_states()
+        for start in range(0, n_samples, chunk_size):
+            x = self._stage('sampling_index', self._sampling_range, start, min(start + chunk_size, n_samples))
+            y = self._generate(x, pos_freq, pos_amp, pos_dur, states)
+            if normalize:
+                y = self._stage('normalize', normalize_inplace, self._owned(x, y), -1.0, 1.0, bounds.bounds)
+            elif bounds is None and self._stage('bounds', RunningBounds().update, y).max > 1:
+                raise ValueError('waveform is out of bounds and cannot be normalized while streaming')
+            yield self._make_points(x, y)
+
+
+    def _bounded_output(self) -> bool: 
+        """If the oscillator and every stage of its pipeline declare a bounded output."""
+        return self.bounded and all(stage.bounded for stage in self._stages)
+
+
+    def _stream_bounds(self, n_samples: int, chunk_size: int, freq: float, amp: float, dur: float) -> RunningBounds:
+        """Find the min and max of a waveform one chunk at a time. This is the first phase 
+        of a normalized stream, the second rescales each chunk with these bounds.
+
+        Returns:
+            RunningBounds: The bounds of the y values.
+        """
+        bounds, states = RunningBounds(), self._stage_states()
+        for start in range(0, n_samples, chunk_size):
+            x = self._sampling_range(start, min(start + chunk_size, n_samples))
+            bounds.update(self._generate(x, freq, amp, dur, states))
+        return bounds 
+
+
+class Sine(Oscillator): 
+
+    bounded = True 
+
+    def _generate_waveform(self, x: List[float],  freq: float, amp: float) -> List[float]:
+        """Generate the y values of a sine wave. Uses the formula found here: 
+        https://en.wikipedia.org/wiki/Sine_wave
+
+        Args:
+            x (List[float]): The x values to use for the calculation. 
+            freq (float): The frequency of the waveform.
+            amp (float): The amplitude of the waveform.
+
+        Returns:
+            List[float]: The y values of the waveform.
+        """
+        if np is not None:
+            return _vectorized(x, amp * np.sin(2 * np.pi * freq * np.asarray(x, dtype=np.float64)))
+        return [amp * math.sin(2 * math.pi * freq * x_i) for x_i in x]
+
+
+class Triangle(Oscillator): 
+
+    bounded = True 
 
     def _generate_waveform(self, x: List[float], freq: float, amp: float=1.0) -> List[float]: 
         """ Generate the y values of triangle wave. Uses the formula found here:
@@ -225,9 +1029,889 @@ class Triangle(Oscillator):
         Returns:
             List[float]: The y values of the waveform.
         """
+        if np is not None:
+            x_arr = np.asarray(x, dtype=np.float64)
+            return _vectorized(x, (2 * amp / np.pi) * np.arcsin(np.sin((2 * np.pi * freq) * x_arr)))
         return [(2 * amp / math.pi) * math.asin(math.sin((2 * math.pi * freq) * x_i)) for x_i in x]
 
 
+# PolyBLEP smooths the jump of a naive waveform over one sample on each side of the 
+# discontinuity which removes most of the aliasing of square and sawtooth waves.
+# https://www.martin-finke.de/articles/audio-plugins-018-polyblep-oscillator/
+def _polyblep(t: float, dt: float) -> float:
+    """The PolyBLEP correction for a phase t in [0, 1) and a phase increment dt."""
+    if t < dt:
+        t /= dt
+        return t + t - t * t - 1.0
+    elif t > 1.0 - dt:
+        t = (t - 1.0) / dt
+        return t * t + t + t + 1.0
+    return 0.0
+
+
+def _polyblep_vectorized(t: 'np.ndarray', dt: float) -> 'np.ndarray':
+    """Same as `_polyblep` for a whole array of phases."""
+    out = np.zeros_like(t)
+    low, high = t < dt, t > 1.0 - dt
+    t_low = t[low] / dt
+    t_high = (t[high] - 1.0) / dt
+    out[low] = t_low + t_low - t_low * t_low - 1.0
+    out[high] = t_high * t_high + t_high + t_high + 1.0
+    return out
+
+
+class Pulse(Oscillator): 
+
+    bounded = True 
+
+    def __init__(self, width: float=0.5, sr: int=44100, compact: bool=False, precision: Optional[int]=5):
+        """A band limited pulse wave that is high for the first `width` of each cycle.
+
+        Args:
+            width (float, optional): The duty cycle between 0 and 1. Defaults to 0.5.
+            sr (int, optional): The sample rate as a positive integer. Defaults to 44100.
+            compact (bool, optional): Use float64 buffers for the output. Defaults to False.
+            precision (Optional[int], optional): The decimals of the y values, None for full 
+                precision. Defaults to 5.
+
+        Raises:
+            ValueError: If width is not between 0 and 1.
+        """
+        if not 0 < width < 1:
+            raise ValueError('width must be between 0 and 1')
+        super().__init__(sr, compact, precision)
+        self._width = width 
+
+
+    def _cache_key(self) -> Tuple:
+        return super()._cache_key() + (self._width,)
+
+
+    def _generate_waveform(self, x: List[float], freq: float, amp: float) -> List[float]:
+        """Generate the y values of a pulse wave with a PolyBLEP correction at the rising 
+        and falling edges. https://en.wikipedia.org/wiki/Pulse_wave
+
+        Args:
+            x (List[float]): The x values to use for the calculation. 
+            freq (float): The frequency of the waveform.
+            amp (float): The amplitude of the waveform.
+
+        Returns:
+            List[float]: The y values of the waveform.
+        """
+        dt, w = min(freq / self._sr, 0.5), self._width
+        if np is not None:
+            t = np.mod(freq * np.asarray(x, dtype=np.float64), 1.0)
+            y = np.where(t < w, 1.0, -1.0) + _polyblep_vectorized(t, dt) - _polyblep_vectorized(np.mod(t + 1.0 - w, 1.0), dt)
+            return _vectorized(x, amp * y)
+        phases = ((freq * x_i) % 1.0 for x_i in x)
+        return [amp * ((1.0 if t < w else -1.0) + _polyblep(t, dt) - _polyblep((t + 1.0 - w) % 1.0, dt)) for t in phases]
+
+
+class Square(Pulse): 
+
+    def __init__(self, sr: int=44100, compact: bool=False, precision: Optional[int]=5):
+        """A band limited square wave, which is a pulse wave with a width of 0.5.
+
+        Args:
+            sr (int, optional): The sample rate as a positive integer. Defaults to 44100.
+            compact (bool, optional): Use float64 buffers for the output. Defaults to False.
+            precision (Optional[int], optional): The decimals of the y values, None for full 
+                precision. Defaults to 5.
+        """
+        super().__init__(0.5, sr, compact, precision)
+
+
+class Sawtooth(Oscillator): 
+
+    bounded = True 
+
+    def _generate_waveform(self, x: List[float], freq: float, amp: float) -> List[float]:
+        """Generate the y values of a rising sawtooth wave with a PolyBLEP correction at the 
+        reset. https://en.wikipedia.org/wiki/Sawtooth_wave
+
+        Args:
+            x (List[float]): The x values to use for the calculation. 
+            freq (float): The frequency of the waveform.
+            amp (float): The amplitude of the waveform.
+
+        Returns:
+            List[float]: The y values of the waveform.
+        """
+        dt = min(freq / self._sr, 0.5)
+        if np is not None:
+            t = np.mod(freq * np.asarray(x, dtype=np.float64), 1.0)
+            return _vectorized(x, amp * (2.0 * t - 1.0 - _polyblep_vectorized(t, dt)))
+        phases = ((freq * x_i) % 1.0 for x_i in x)
+        return [amp * (2.0 * t - 1.0 - _polyblep(t, dt)) for t in phases]
+
+
+# Noise is computed by hashing the seed and the sample number with splitmix64 instead of 
+# drawing from a random generator. Every sample only depends on its own number, so chunks 
+# from `stream` match `calc` and the numpy and pure python paths produce the same values.
+# https://prng.di.unimi.it/splitmix64.c
+_MASK64 = 2 ** 64 - 1
+
+
+def _noise(stream: int, n: int) -> float:
+    """A uniform value in [-1, 1) for sample number n of a noise stream."""
+    z = (n + stream * 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    z ^= z >> 31
+    return (z >> 11) * 2.0 ** -53 * 2.0 - 1.0
+
+
+def _noise_vectorized(stream: int, n: 'np.ndarray') -> 'np.ndarray':
+    """Same as `_noise` for an array of uint64 sample numbers."""
+    z = n + np.uint64((stream * 0x9E3779B97F4A7C15) & _MASK64)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return (z >> np.uint64(11)).astype(np.float64) * 2.0 ** -53 * 2.0 - 1.0
+
+
+class WhiteNoise(Oscillator): 
+
+    bounded = True 
+
+    def __init__(self, seed: int=0, sr: int=44100, compact: bool=False, precision: Optional[int]=5):
+        """Seeded white noise. The same seed always produces the same samples.
+
+        Args:
+            seed (int, optional): The seed. Defaults to 0.
+            sr (int, optional): The sample rate as a positive integer. Defaults to 44100.
+            compact (bool, optional): Use float64 buffers for the output. Defaults to False.
+            precision (Optional[int], optional): The decimals of the y values, None for full 
+                precision. Defaults to 5.
+        """
+        super().__init__(sr, compact, precision)
+        self._seed = seed 
+
+
+    def _cache_key(self) -> Tuple:
+        return super()._cache_key() + (self._seed,)
+
+
+    def _generate_waveform(self, x: List[float], freq: float, amp: float) -> List[float]:
+        """Generate uniform noise in [-amp, amp). The frequency is ignored.
+
+        Args:
+            x (List[float]): The x values to use for the calculation. 
+            freq (float): Not used.
+            amp (float): The amplitude of the waveform.
+
+        Returns:
+            List[float]: The y values of the waveform.
+        """
+        stream = self._seed * 64
+        if np is not None:
+            n = np.rint(np.asarray(x, dtype=np.float64) * self._sr).astype(np.uint64)
+            return _vectorized(x, amp * _noise_vectorized(stream, n))
+        return [amp * _noise(stream, round(x_i * self._sr)) for x_i in x]
+
+
+class PinkNoise(WhiteNoise): 
+    """Seeded pink noise using the Voss-McCartney algorithm. Row k of the generator holds a 
+    white noise value that changes every 2**k samples and the output is the mean of the rows. 
+    https://www.firstpr.com.au/dsp/pink-noise/
+    """
+
+    ROWS = 16
+
+    def _generate_waveform(self, x: List[float], freq: float, amp: float) -> List[float]:
+        """Generate pink noise in [-amp, amp). The frequency is ignored.
+
+        Args:
+            x (List[float]): The x values to use for the calculation. 
+            freq (float): Not used.
+            amp (float): The amplitude of the waveform.
+
+        Returns:
+            List[float]: The y values of the waveform.
+        """
+        streams = [self._seed * 64 + k for k in range(self.ROWS)]
+        if np is not None:
+            n = np.rint(np.asarray(x, dtype=np.float64) * self._sr).astype(np.uint64)
+            y = sum(_noise_vectorized(stream, n >> np.uint64(k)) for k, stream in enumerate(streams))
+            return _vectorized(x, (amp / self.ROWS) * y)
+        sample_numbers = (round(x_i * self._sr) for x_i in x)
+        return [(amp / self.ROWS) * sum(_noise(stream, n >> k) for k, stream in enumerate(streams)) for n in sample_numbers]
+
+
+class Wavetable(Oscillator): 
+
+    def __init__(self, 
+        source: Oscillator, 
+        size: int=2048, 
+        interpolation: str='linear', 
+        sr: int=44100, 
+        compact: bool=False, 
+        precision: Optional[int]=5):
+        """An oscillator that precomputes one cycle of another oscillator into a lookup table 
+        and synthesizes any frequency by reading the table at the phase of each sample. 
+        The phase is taken from the sampling index so chunks from `stream` stay continuous.
+
+        Args:
+            source (Oscillator): The oscillator to sample one cycle from.
+            size (int, optional): The number of points in the table. Defaults to 2048.
+            interpolation (str, optional): 'linear' or 'cubic' interpolation between table points. 
+                Defaults to 'linear'.
+            sr (int, optional): The sample rate as a positive integer. Defaults to 44100.
+            compact (bool, optional): Use float64 buffers for the output. Defaults to False.
+            precision (Optional[int], optional): The decimals of the y values, None for full 
+                precision. Defaults to 5.
+
+        Raises:
+            ValueError: If size is less then 4 or interpolation is not a known mode.
+        """
+        if size < 4:
+            raise ValueError('size must be at least 4')
+        if interpolation not in ('linear', 'cubic'):
+            raise ValueError(f'unknown interpolation {interpolation}')
+        super().__init__(sr, compact, precision)
+        self._source = source 
+        self._size = size 
+        self._interpolation = interpolation
+        self._table = list(source._generate_waveform([i / size for i in range(size)], 1.0, 1.0))
+
+
+    @property 
+    def bounded(self) -> bool: 
+        """Linear interpolation stays between the table values, cubic interpolation can overshoot them."""
+        return self._interpolation == 'linear' and self._source.bounded 
+
+
+    def _cache_key(self) -> Tuple:
+        return super()._cache_key() + (self._source._cache_key(), self._size, self._interpolation)
+
+
+    def _generate_waveform(self, x: List[float], freq: float, amp: float) -> List[float]:
+        """Generate the y values by looking up the phase of each x value in the table.
+
+        Args:
+            x (List[float]): The x values to use for the calculation. 
+            freq (float): The frequency of the waveform.
+            amp (float): The amplitude of the waveform.
+
+        Returns:
+            List[float]: The y values of the waveform.
+        """
+        if np is not None:
+            return _vectorized(x, amp * self._lookup_vectorized(np.asarray(x, dtype=np.float64), freq))
+        return [amp * self._lookup((freq * x_i) % 1.0) for x_i in x]
+
+
+    def _lookup(self, phase: float) -> float:
+        """Interpolate the table at a phase in [0, 1)."""
+        t, n = self._table, self._size
+        pos = phase * n
+        i = int(pos)
+        f = pos - i
+        i %= n
+        p1, p2 = t[i], t[(i + 1) % n]
+        if self._interpolation == 'linear':
+            return p1 + f * (p2 - p1)
+        p0, p3 = t[i - 1], t[(i + 2) % n]
+        return p1 + 0.5 * f * (p2 - p0 + f * (2 * p0 - 5 * p1 + 4 * p2 - p3 + f * (3 * (p1 - p2) + p3 - p0)))
+
+
+    def _lookup_vectorized(self, x: 'np.ndarray', freq: float) -> 'np.ndarray':
+        """Same as `_lookup` for a whole array of x values."""
+        t, n = np.asarray(self._table, dtype=np.float64), self._size
+        pos = np.mod(freq * x, 1.0) * n
+        i = pos.astype(np.intp)
+        f = pos - i
+        i %= n
+        p1, p2 = t[i], t[(i + 1) % n]
+        if self._interpolation == 'linear':
+            return p1 + f * (p2 - p1)
+        p0, p3 = t[i - 1], t[(i + 2) % n]
+        return p1 + 0.5 * f * (p2 - p0 + f * (2 * p0 - 5 * p1 + 4 * p2 - p3 + f * (3 * (p1 - p2) + p3 - p0)))
+
+
+    def max_error(self, samples: Optional[int]=None) -> float:
+        """Measure the largest absolute difference between the table and the source oscillator 
+        over one cycle. The points are placed between the table entries where the 
+        interpolation error is largest.
+
+        Args:
+            samples (Optional[int], optional): The number of points to check. Defaults to 4 * size.
+
+        Returns:
+            float: The max absolute error for amp = 1.
+        """
+        samples = samples or 4 * self._size
+        x = [(i + 0.5) / samples for i in range(samples)]
+        table_y = self._generate_waveform(x, 1.0, 1.0)
+        source_y = self._source._generate_waveform(x, 1.0, 1.0)
+        return max(abs(a - b) for a, b in zip(table_y, source_y))
+
+
+def _like(x: Sequence[float], values: Iterable[float]) -> Union[List[float], array.array]:
+    """The pure python counterpart of `_vectorized`, a float64 buffer if x is one and otherwise a list."""
+    return array.array('d', values) if isinstance(x, array.array) else list(values)
+
+
+class PipelineStage(object): 
+    """A stage of the oscillator generation pipeline that is added with `Oscillator.pipe`. 
+    Phase stages (modulates_phase = True) override `phase` and change the phase the waveform 
+    is generated at, the other stages override `apply` and scale the generated buffer. 
+    Both work on a whole block of samples at once.
+    """
+
+    name = 'stage'
+    modulates_phase = False 
+    # True if the stage keeps a waveform that is inside [-1, 1] inside it
+    bounded = False 
+
+
+    def _cache_key(self) -> Tuple: 
+        """A hashable description of the stage config used by WaveCache."""
+        return (type(self),)
+
+
+    def phase(self, 
+        x: Sequence[float], 
+        x_gen: Sequence[float], 
+        freq: float, 
+        sr: int, 
+        state: Dict) -> Tuple[Sequence[float], float]:
+        """Change the x values and frequency given to `_generate_waveform`.
+
+        Args:
+            x (Sequence[float]): The sampling index of the block.
+            x_gen (Sequence[float]): The x values from the previous phase stage.
+            freq (float): The frequency from the previous phase stage.
+            sr (int): The sample rate of the oscillator.
+            state (Dict): The state of this stage in the current stream, which is carried from 
+                one block to the next. A stage instance can be used by several streams at once 
+                so anything that depends on the previous blocks belongs here.
+
+        Returns:
+            Tuple[Sequence[float], float]: The new x values and frequency.
+        """
+        return x_gen, freq 
+
+
+    def apply(self, x: Sequence[float], y: Sequence[float], dur: float) -> Sequence[float]:
+        """Change the y values of a block.
+
+        Args:
+            x (Sequence[float]): The sampling index of the block.
+            y (Sequence[float]): The y values of the block.
+            dur (float): The duration of the whole waveform in seconds.
+
+        Returns:
+            Sequence[float]: The new y values.
+        """
+        return y 
+
+
+class ADSR(PipelineStage): 
+
+    name = 'envelope'
+    bounded = True 
+
+
+    def __init__(self, 
+        attack: float=0.01, 
+        decay: float=0.1, 
+        sustain: float=0.7, 
+        release: float=0.2, 
+        gate: Optional[float]=None):
+        """A linear attack, decay, sustain, release envelope. The level rises from 0 to 1 over 
+        the attack, falls to the sustain level over the decay and falls to 0 over the release 
+        which starts when the gate closes. 
+
+        Args:
+            attack (float, optional): The attack time in seconds. Defaults to 0.01.
+            decay (float, optional): The decay time in seconds. Defaults to 0.1.
+            sustain (float, optional): The sustain level between 0 and 1. Defaults to 0.7.
+            release (float, optional): The release time in seconds. Defaults to 0.2.
+            gate (Optional[float], optional): The time in seconds the note is released at. 
+                Defaults to None which releases so the envelope ends with the waveform.
+
+        Raises:
+            ValueError: If a time is negative or sustain is not between 0 and 1.
+        """
+        if min(attack, decay, release) < 0 or (gate is not None and gate < 0):
+            raise ValueError('envelope times cannot be negative')
+        if not 0 <= sustain <= 1:
+            raise ValueError('sustain must be between 0 and 1')
+        self._attack, self._decay, self._sustain, self._release = attack, decay, sustain, release 
+        self._gate = gate 
+
+
+    def _cache_key(self) -> Tuple: 
+        return super()._cache_key() + (self._attack, self._decay, self._sustain, self._release, self._gate)
+
+
+    def _gate_time(self, dur: float) -> float:
+        return self._gate if self._gate is not None else max(dur - self._release, 0.0)
+
+
+    def level(self, t: float, dur: float) -> float:
+        """The envelope level at time t of a waveform that is dur seconds long."""
+        gate = self._gate_time(dur)
+        if t < gate:
+            return self._held_level(t)
+        if self._release == 0:
+            return 0.0
+        return self._held_level(gate) * max(1.0 - (t - gate) / self._release, 0.0)
+
+
+    def _held_level(self, t: float) -> float:
+        """The level before the gate closes."""
+        a, d, s = self._attack, self._decay, self._sustain
+        if t < a:
+            return t / a
+        if t < a + d:
+            return 1.0 - (1.0 - s) * (t - a) / d
+        return s 
+
+
+    def _levels_vectorized(self, t: 'np.ndarray', dur: float) -> 'np.ndarray':
+        """Same as `level` for a whole array of times."""
+        a, d, s, r = self._attack, self._decay, self._sustain, self._release
+        gate = self._gate_time(dur)
+        held = np.full_like(t, s)
+        if d > 0:
+            decaying = t < a + d
+            held[decaying] = 1.0 - (1.0 - s) * (t[decaying] - a) / d
+        if a > 0:
+            attacking = t < a
+            held[attacking] = t[attacking] / a
+        released = t >= gate
+        if r > 0:
+            held[released] = self._held_level(gate) * np.maximum(1.0 - (t[released] - gate) / r, 0.0)
+        else:
+            held[released] = 0.0
+        return held 
+
+
+    def apply(self, x: Sequence[float], y: Sequence[float], dur: float) -> Sequence[float]:
+        if np is not None:
+            t = np.asarray(x, dtype=np.float64)
+            return _vectorized(x, np.asarray(y, dtype=np.float64) * self._levels_vectorized(t, dur))
+        return _like(x, (y_i * self.level(t, dur) for t, y_i in zip(x, y)))
+
+
+class AmplitudeModulation(PipelineStage): 
+
+    name = 'amplitude_modulation'
+
+
+    def __init__(self, modulator: Oscillator, mod_freq: float, depth: float=0.5):
+        """Scale the waveform by (1 + depth * m) / (1 + depth) where m is the output of another 
+        oscillator at mod_freq, which keeps the result between -1 and 1. A depth of 0 leaves 
+        the waveform unchanged.
+
+        Args:
+            modulator (Oscillator): The oscillator that generates m.
+            mod_freq (float): The frequency of the modulator.
+            depth (float, optional): The modulation depth between 0 and 1. Defaults to 0.5.
+
+        Raises:
+            ValueError: If depth is not between 0 and 1.
+        """
+        if not 0 <= depth <= 1:
+            raise ValueError('depth must be between 0 and 1')
+        self._modulator = modulator 
+        self._mod_freq = abs(mod_freq)
+        self._depth = depth 
+
+
+    @property 
+    def bounded(self) -> bool: 
+        """The scale stays between 0 and 1 as long as the modulator stays inside [-1, 1]."""
+        return self._modulator.bounded 
+
+
+    def _cache_key(self) -> Tuple: 
+        return super()._cache_key() + (self._modulator._cache_key(), self._mod_freq, self._depth)
+
+
+    def apply(self, x: Sequence[float], y: Sequence[float], dur: float) -> Sequence[float]:
+        m, depth = self._modulator._generate_waveform(x, self._mod_freq, 1.0), self._depth 
+        if np is not None:
+            gain = (1.0 + depth * np.asarray(m, dtype=np.float64)) / (1.0 + depth)
+            return _vectorized(x, np.asarray(y, dtype=np.float64) * gain)
+        return _like(x, (y_i * (1.0 + depth * m_i) / (1.0 + depth) for y_i, m_i in zip(y, m)))
+
+
+class FrequencyModulation(PipelineStage): 
+
+    name = 'frequency_modulation'
+    modulates_phase = True 
+    bounded = True 
+
+
+    def __init__(self, modulator: Oscillator, mod_freq: float, deviation: float):
+        """Vary the frequency of the waveform by up to deviation Hz with the output of another 
+        oscillator at mod_freq. The phase is accumulated sample by sample:
+
+            phase[n] = freq * x[n] + deviation * (m[0] + ... + m[n - 1]) / sr
+
+        The running sum at the end of a block is kept in the stream state so the blocks of 
+        `stream` continue it without going back to the first sample. A block that does not 
+        follow the previous one sums the modulator up to its first sample.
+
+        Args:
+            modulator (Oscillator): The oscillator that generates m.
+            mod_freq (float): The frequency of the modulator.
+            deviation (float): The peak frequency deviation in Hz.
+        """
+        self._modulator = modulator 
+        self._mod_freq = abs(mod_freq)
+        self._deviation = deviation 
+
+
+    def _cache_key(self) -> Tuple: 
+        return super()._cache_key() + (self._modulator._cache_key(), self._mod_freq, self._deviation)
+
+
+    def _running_sum(self, start: int, sr: int, carry: Optional[Tuple], block_size: int=65536) -> float:
+        """The sum of the modulator over the sample numbers before start.
+
+        Args:
+            start (int): The first sample number of the block.
+            sr (int): The sample rate.
+            carry (Optional[Tuple]): The (sr, next sample number, running sum) after the 
+                previous block of the stream or None.
+            block_size (int, optional): The samples of the modulator generated at once when the 
+                sum has to be recomputed. Defaults to 65536.
+
+        Returns:
+            float: The running sum.
+        """
+        if start == 0:
+            return 0.0
+        if carry is not None and carry[:2] == (sr, start):
+            return carry[2]
+        total = 0.0
+        for block in range(0, start, block_size):
+            end = min(block + block_size, start)
+            if np is not None:
+                m = self._modulator._generate_waveform((np.arange(block, end) / sr).tolist(), self._mod_freq, 1.0)
+                # a cumsum adds in the same order as the block by block carry
+                total = float(np.cumsum(np.concatenate(([total], np.asarray(m, dtype=np.float64))))[-1])
+                continue 
+            m = self._modulator._generate_waveform([num / sr for num in range(block, end)], self._mod_freq, 1.0)
+            for m_i in m:
+                total += m_i
+        return total 
+
+
+    def phase(self, 
+        x: Sequence[float], 
+        x_gen: Sequence[float], 
+        freq: float, 
+        sr: int, 
+        state: Dict) -> Tuple[Sequence[float], float]:
+        if len(x) == 0:
+            return x_gen, freq 
+        start = round(x[0] * sr)
+        total = self._running_sum(start, sr, state.get('carry'))
+        m = self._modulator._generate_waveform(x, self._mod_freq, 1.0)
+        # the phase is given back as x values for the carrier frequency so any oscillator 
+        # that computes its phase as freq * x can be modulated, freq 0 uses the phase as x
+        gen_freq = freq if freq > 0 else 1.0
+        if np is not None:
+            m_arr = np.asarray(m, dtype=np.float64)
+            sums = np.cumsum(np.concatenate(([total], m_arr[:-1])))
+            state['carry'] = (sr, start + len(x), float(sums[-1] + m_arr[-1]))
+            phase = freq * np.asarray(x_gen, dtype=np.float64) + (self._deviation / sr) * sums
+            return _vectorized(x, phase / gen_freq), gen_freq 
+        sums = []
+        for m_i in m:
+            sums.append(total)
+            total += m_i
+        state['carry'] = (sr, start + len(x), total)
+        scale = self._deviation / sr
+        return _like(x, ((freq * x_i + scale * s_i) / gen_freq for x_i, s_i in zip(x_gen, sums))), gen_freq 
+
+
+def _y_values(points: Union[List[Point], PointArray]) -> Sequence[float]:
+    """The y values of a list of Points or the y buffer of a PointArray."""
+    if isinstance(points, PointArray):
+        return points.y
+    return [point.y for point in points]
+
+
+def _check_pcm_format(bit_depth: int, is_float: bool) -> None:
+    """Check that the bit depth is supported for integer or float samples.
+
+    Args:
+        bit_depth (int): The bit depth.
+        is_float (bool): If the samples are float32.
+
+    Raises:
+        ValueError: If the bit depth is not supported.
+    """
+    if is_float and bit_depth != 32:
+        raise ValueError('float samples must have a bit depth of 32')
+    if bit_depth not in (16, 24, 32):
+        raise ValueError('bit depth must be 16, 24 or 32')
+
+
+def _encode_pcm(y: Sequence[float], bit_depth: int=16, is_float: bool=False) -> bytes:
+    """Encode samples as little endian PCM bytes. Integer samples are clipped to [-1, 1] 
+    and scaled to the full range of the bit depth.
+
+    Args:
+        y (Sequence[float]): The samples.
+        bit_depth (int, optional): 16, 24 or 32 for integers. Must be 32 for floats. Defaults to 16.
+        is_float (bool, optional): Encode as float32 instead of integers. Defaults to False.
+
+    Raises:
+        ValueError: If the bit depth is not supported.
+
+    Returns:
+        bytes: The encoded samples.
+    """
+    _check_pcm_format(bit_depth, is_float)
+    if is_float:
+        if np is not None:
+            return np.asarray(y, dtype='<f4').tobytes()
+        buf = array.array('f', y)
+    else:
+        scale = 2 ** (bit_depth - 1) - 1
+        if np is not None:
+            ints = np.rint(np.clip(np.asarray(y, dtype=np.float64), -1.0, 1.0) * scale)
+            if bit_depth == 16:
+                return ints.astype('<i2').tobytes()
+            raw = ints.astype('<i4')
+            return raw.tobytes() if bit_depth == 32 else raw.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+        buf = array.array('h' if bit_depth == 16 else 'i', (round(min(max(y_i, -1.0), 1.0) * scale) for y_i in y))
+    if sys.byteorder == 'big':
+        buf.byteswap()
+    if bit_depth == 24:
+        raw = bytearray(buf.tobytes())
+        del raw[3::4] # drop the high byte of each little endian int32
+        return bytes(raw)
+    return buf.tobytes()
+
+
+def write_pcm(buffer: BinaryIO, 
+    chunks: Iterable[Union[List[Point], PointArray]], 
+    bit_depth: int=16, 
+    is_float: bool=False) -> int:
+    """Write raw PCM samples to a binary buffer with one write per chunk. The chunks can be 
+    a single waveform in a list or the generator returned by `Oscillator.stream`.
+
+    Args:
+        buffer (BinaryIO): A writable binary file-like object.
+        chunks (Iterable[Union[List[Point], PointArray]]): The blocks of points to write.
+        bit_depth (int, optional): 16, 24 or 32. Defaults to 16.
+        is_float (bool, optional): Write float32 samples. Defaults to False.
+
+    Raises:
+        ValueError: If the bit depth is not supported.
+
+    Returns:
+        int: The number of samples written.
+    """
+    _check_pcm_format(bit_depth, is_float)
+    n_samples = 0
+    for chunk in chunks:
+        buffer.write(_encode_pcm(_y_values(chunk), bit_depth, is_float))
+        n_samples += len(chunk)
+    return n_samples
+
+
+def write_wav(path: str, 
+    chunks: Iterable[Union[List[Point], PointArray]], 
+    sr: int, 
+    bit_depth: int=16, 
+    is_float: bool=False) -> int:
+    """Write a mono WAV file. The header is written with empty sizes, the samples are 
+    streamed after it and the sizes are filled in at the end so the chunks never need to be 
+    held in memory at once.
+
+    Args:
+        path (str): The file path.
+        chunks (Iterable[Union[List[Point], PointArray]]): The blocks of points to write.
+        sr (int): The sample rate.
+        bit_depth (int, optional): 16, 24 or 32. Defaults to 16.
+        is_float (bool, optional): Write float32 samples. Defaults to False.
+
+    Raises:
+        ValueError: If the bit depth is not supported. The file is not created in that case.
+
+    Returns:
+        int: The number of samples written.
+    """
+    _check_pcm_format(bit_depth, is_float)
+    block_align = bit_depth // 8
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 0, b'WAVE', b'fmt ', 16, 3 if is_float else 1, 
+            1, sr, sr * block_align, block_align, bit_depth, b'data', 0))
+        n_samples = write_pcm(f, chunks, bit_depth, is_float)
+        data_size = n_samples * block_align
+        if data_size % 2:
+            f.write(b'\x00') # chunks are padded to an even size
+        f.seek(4)
+        f.write(struct.pack('<I', 36 + data_size + data_size % 2))
+        f.seek(40)
+        f.write(struct.pack('<I', data_size))
+    return n_samples
+
+
+def _apply_samples(y: array.array, other: Union[float, Sequence[float]], op: str) -> None:
+    """Apply a bulk operation to a float64 buffer in place. 'gain' multiplies by a number, 
+    'add' and 'mul' combine with a sequence of at most len(y) samples where the missing 
+    samples of the sequence count as silence.
+
+    Args:
+        y (array.array): The buffer to change.
+        other (Union[float, Sequence[float]]): A number for 'gain' or the samples to combine.
+        op (str): 'gain', 'add' or 'mul'.
+    """
+    if op == 'gain':
+        other = float(other)
+        if np is not None:
+            np.frombuffer(y, dtype=np.float64)[:] *= other
+        else:
+            for i, y_i in enumerate(y):
+                y[i] = y_i * other
+        return 
+    m = len(other)
+    if np is not None:
+        target = np.frombuffer(y, dtype=np.float64)
+        source = np.frombuffer(other, dtype=np.float64) if isinstance(other, array.array) and other.typecode == 'd' \
+            else np.fromiter(other, dtype=np.float64, count=m)
+        if op == 'add':
+            target[:m] += source
+        else:
+            target[:m] *= source
+            target[m:] = 0.0
+        return 
+    for i, o_i in enumerate(other):
+        y[i] = y[i] + o_i if op == 'add' else y[i] * o_i
+    if op == 'mul':
+        for i in range(m, len(y)):
+            y[i] = 0.0
+
+
+# The windowed sinc resampler uses a Blackman windowed sinc low pass filter with this many 
+# zero crossings on each side. The filter is split into one phase per output position between 
+# two input samples (polyphase) when there are few enough distinct positions.
+# https://ccrma.stanford.edu/~jos/resample/
+_RESAMPLE_ZEROS = 16
+_RESAMPLE_MAX_PHASES = 4096
+
+
+def _sinc_kernel(d: float, cutoff: float, half: float) -> float:
+    """The filter weight of an input sample d input samples away from the output position."""
+    if abs(d) >= half:
+        return 0.0
+    u, t = d / half, cutoff * d
+    window = 0.42 + 0.5 * math.cos(math.pi * u) + 0.08 * math.cos(2 * math.pi * u)
+    return cutoff * (1.0 if t == 0 else math.sin(math.pi * t) / (math.pi * t)) * window
+
+
+def _sinc_kernel_vectorized(d: 'np.ndarray', cutoff: float, half: float) -> 'np.ndarray':
+    """Same as `_sinc_kernel` for an array of distances."""
+    u = d / half
+    window = 0.42 + 0.5 * np.cos(np.pi * u) + 0.08 * np.cos(2 * np.pi * u)
+    return np.where(np.abs(d) < half, cutoff * np.sinc(cutoff * d) * window, 0.0)
+
+
+def _resample_taps(up: int, down: int, quality: str) -> Tuple[float, float, int]:
+    """The filter cutoff, half width and taps on each side of a resampling by up / down."""
+    cutoff = min(1.0, up / down)
+    half = _RESAMPLE_ZEROS / cutoff
+    return cutoff, half, 1 if quality == 'linear' else math.ceil(half)
+
+
+def _resample_block(y: Sequence[float], start: int, stop: int, up: int, down: int, quality: str) -> Sequence[float]:
+    """Compute output samples [start, stop) of a resampling by up / down. Output sample j 
+    sits at input position j * down / up and only the input samples around the block are read.
+
+    Args:
+        y (Sequence[float]): The input samples.
+        start (int): The first output sample.
+        stop (int): The output sample to stop before.
+        up (int): The new sample rate divided by the gcd of both rates.
+        down (int): The old sample rate divided by the gcd of both rates.
+        quality (str): 'linear' or 'sinc'.
+
+    Returns:
+        Sequence[float]: The output samples.
+    """
+    n = len(y)
+    cutoff, half, k = _resample_taps(up, down, quality)
+    seg_lo = start * down // up - k + 1
+    seg_hi = (stop - 1) * down // up + k + 1
+    pad_lo, pad_hi = max(0, -seg_lo), max(0, seg_hi - n)
+    lo, hi = max(seg_lo, 0), min(seg_hi, n)
+    if np is not None:
+        seg = np.zeros(seg_hi - seg_lo)
+        if isinstance(y, array.array) and y.typecode == 'd':
+            seg[pad_lo:pad_lo + hi - lo] = np.frombuffer(y, dtype=np.float64)[lo:hi]
+        else:
+            seg[pad_lo:pad_lo + hi - lo] = np.fromiter(y[lo:hi], dtype=np.float64, count=hi - lo)
+        if quality == 'linear' and pad_hi and hi > lo: # repeat the last sample instead of fading to silence
+            seg[len(seg) - pad_hi:] = seg[len(seg) - pad_hi - 1]
+        num = np.arange(start, stop, dtype=np.int64) * down
+        base, frac = num // up - seg_lo, (num % up) / up
+        if quality == 'linear':
+            return seg[base] + frac * (seg[base + 1] - seg[base])
+        taps = np.arange(2 * k)
+        if up <= _RESAMPLE_MAX_PHASES:
+            table = _sinc_kernel_vectorized(np.arange(up)[:, None] / up + (k - 1) - taps, cutoff, half)
+            weights = table[num % up]
+        else:
+            weights = _sinc_kernel_vectorized(frac[:, None] + (k - 1) - taps, cutoff, half)
+        return np.einsum('ij,ij->i', weights, seg[(base - k + 1)[:, None] + taps])
+    segment = [0.0] * pad_lo + list(y[lo:hi]) + [0.0] * pad_hi
+    if quality == 'linear' and pad_hi and hi > lo:
+        segment[len(segment) - pad_hi:] = [segment[len(segment) - pad_hi - 1]] * pad_hi
+    out = []
+    for j in range(start, stop):
+        base, frac = j * down // up - seg_lo, (j * down % up) / up
+        if quality == 'linear':
+            out.append(segment[base] + frac * (segment[base + 1] - segment[base]))
+        else:
+            first = base - k + 1
+            out.append(sum(_sinc_kernel(frac + (k - 1) - t, cutoff, half) * segment[first + t] for t in range(2 * k)))
+    return out
+
+
+def _fft(values: Sequence[complex]) -> List[complex]:
+    """An iterative radix-2 Cooley-Tukey FFT used when numpy is not available. 
+    https://en.wikipedia.org/wiki/Cooley%E2%80%93Tukey_FFT_algorithm
+
+    Args:
+        values (Sequence[complex]): The input with a power of two length.
+
+    Returns:
+        List[complex]: The discrete fourier transform of values.
+    """
+    n = len(values)
+    a = list(values)
+    j = 0
+    for i in range(1, n): # reorder the input by bit reversed index
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j ^= bit
+        if i < j:
+            a[i], a[j] = a[j], a[i]
+    size = 2
+    while size <= n:
+        half = size // 2
+        twiddles = [cmath.exp(-2j * math.pi * k / size) for k in range(half)]
+        for start in range(0, n, size):
+            for k in range(half):
+                u, v = a[start + k], a[start + k + half] * twiddles[k]
+                a[start + k], a[start + k + half] = u + v, u - v
+        size *= 2
+    return a
+
+
 class Waveform(object):
     """Waveform's job is to interface with the 
     Point API to deliver the correct list of specified objects to the user in a
@@ -236,19 +1920,344 @@ class Waveform(object):
     """
 
 
-    def __init__(self, points: List[Point]): 
+    def __init__(self, points: Union[List[Point], PointArray], sr: Optional[int]=None): 
         """A container class that holds points. 
 
         Args:
-            points (List[Point]): A list of Points from an Oscillator
+            points (Union[List[Point], PointArray]): A list of Points or a PointArray from an Oscillator
+            sr (Optional[int], optional): The sample rate the points were generated at. Defaults to None.
         """
         self._points = points 
+        self._sr = sr 
+        self._frozen = False 
+
+
+    @property 
+    def sr(self) -> Optional[int]: 
+        return self._sr 
+
+
+    @property 
+    def frozen(self) -> bool: 
+        """True if the Waveform is shared through a WaveCache and its samples must not change."""
+        return self._frozen 
+
+
+    def freeze(self) -> 'Waveform': 
+        """Mark the samples as read only so the in place operators copy them instead. 
+
+        Returns:
+            Waveform: self so calls can be chained.
+        """
+        self._frozen = True 
+        return self 
+
+
+    @classmethod
+    def open(cls, path: str, mode: str='r', sr: Optional[int]=None, typecode: str='d') -> 'Waveform':
+        """Memory map a WAV file or a file of raw float samples. Nothing is read up front 
+        except the WAV chunk headers, the samples are read from the mapped pages when they 
+        are accessed.
+
+        Args:
+            path (str): The file path.
+            mode (str, optional): Only 'r' for read only access is supported. Defaults to 'r'.
+            sr (Optional[int], optional): The sample rate of a raw file. WAV files use their own. Defaults to None.
+            typecode (str, optional): 'f' for float32 or 'd' for float64 raw samples. Defaults to 'd'.
+
+        Raises:
+            ValueError: If the mode, typecode or file format is not supported or a raw file has no sr.
+
+        Returns:
+            Waveform: A Waveform over the mapped samples.
+        """
+        if mode != 'r':
+            raise ValueError('only read mode is supported')
+        with open(path, 'rb') as f:
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b'')
+        if view[:4] == b'RIFF' and view[8:12] == b'WAVE':
+            samples, sr = _map_wav(view)
+        elif typecode not in ('f', 'd'):
+            raise ValueError('typecode must be f or d')
+        elif sr is None:
+            raise ValueError('a sample rate is needed to open raw samples')
+        else:
+            itemsize = struct.calcsize(typecode)
+            samples = MappedSamples(view[:len(view) - len(view) % itemsize].cast(typecode))
+        return cls(PointArray(SamplingIndex(range(len(samples)), sr), samples), sr)
+
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Point, 'Waveform']: 
+        if isinstance(idx, slice):
+            # a step would change the sample rate the other methods rely on
+            if idx.step not in (None, 1):
+                raise ValueError('Waveform slices cannot have a step')
+            return Waveform(self._points[idx], self._sr)
+        return self._points[idx]
+
+
+    def normalized(self, a: float=-1.0, b: float=1.0) -> 'Waveform':
+        """Return a new Waveform with the y values scaled between the range [a, b]. Mapped 
+        samples stay on disk and are only rescaled when they are read.
+
+        Args:
+            a (float, optional): The min value. Defaults to -1.0.
+            b (float, optional): The max value. Defaults to 1.0.
+
+        Returns:
+            Waveform: The normalized Waveform.
+        """
+        y = _y_values(self._points)
+        new_y = y.normalized(a, b) if isinstance(y, MappedSamples) else normalize(y, a, b)
+        if isinstance(self._points, PointArray):
+            return Waveform(PointArray(self._points.x, new_y), self._sr)
+        return Waveform([Point(point.x, y_i) for point, y_i in zip(self._points, new_y)], self._sr)
     
 
-    def points(self, as_type: str='objects') -> List[Union[Point, Tuple, Dict]]:
+    def __len__(self) -> int: 
+        return len(self._points)
+
+
+    def _x_values(self) -> Sequence[float]:
+        """The x values of the points without copying a PointArray."""
+        if isinstance(self._points, PointArray):
+            return self._points.x 
+        return array.array('d', (point.x for point in self._points))
+
+
+    def _check_sr(self, other: 'Waveform') -> None:
+        """Raise a ValueError if other was generated at a different sample rate."""
+        if self._sr != other._sr:
+            raise ValueError(f'sample rates do not match: {self._sr} != {other._sr}')
+
+
+    def _combine(self, other: 'Waveform', op: str) -> 'Waveform':
+        """Mix or multiply the samples of two waveforms into a new buffer. The shorter 
+        waveform is treated as silence after its end.
+        """
+        self._check_sr(other)
+        longer, shorter = (self, other) if len(self) >= len(other) else (other, self)
+        y = array.array('d', _y_values(longer._points))
+        _apply_samples(y, _y_values(shorter._points), op)
+        return Waveform(PointArray(longer._x_values(), y), self._sr)
+
+
+    def _writable_samples(self, other_len: int) -> Optional[array.array]:
+        """The y buffer of this waveform if it can be changed in place by an operation 
+        with a waveform of other_len samples, otherwise None. Frozen waveforms are never 
+        changed in place.
+        """
+        if not self._frozen and isinstance(self._points, PointArray) and isinstance(self._points.y, array.array) \
+            and self._points.y.typecode == 'd' and other_len <= len(self):
+            return self._points.y 
+        return None 
+
+
+    def __add__(self, other: 'Waveform') -> 'Waveform': 
+        """Mix two waveforms by adding their samples."""
+        if not isinstance(other, Waveform):
+            return NotImplemented
+        return self._combine(other, 'add')
+
+
+    def __radd__(self, other: object) -> 'Waveform': 
+        # lets `sum` mix a list of waveforms since it starts from 0
+        if other == 0:
+            return self 
+        return NotImplemented
+
+
+    def __mul__(self, other: Union[float, 'Waveform']) -> 'Waveform': 
+        """Apply a gain with a number or ring modulate with another waveform."""
+        if isinstance(other, Waveform):
+            return self._combine(other, 'mul')
+        if not isinstance(other, numbers.Real):
+            return NotImplemented
+        y = array.array('d', _y_values(self._points))
+        _apply_samples(y, other, 'gain')
+        return Waveform(PointArray(self._x_values(), y), self._sr)
+
+
+    __rmul__ = __mul__
+
+
+    def __iadd__(self, other: 'Waveform') -> 'Waveform': 
+        """Mix other into this waveform. The samples are changed in place when they are held 
+        in a buffer that is at least as long as other and the waveform is not frozen, 
+        otherwise a new Waveform is returned.
+        """
+        if not isinstance(other, Waveform):
+            return NotImplemented
+        self._check_sr(other)
+        y = self._writable_samples(len(other))
+        if y is None:
+            return self + other 
+        _apply_samples(y, _y_values(other._points), 'add')
+        return self 
+
+
+    def __imul__(self, other: Union[float, 'Waveform']) -> 'Waveform': 
+        """Apply a gain or ring modulate in place, see `__iadd__`."""
+        if isinstance(other, Waveform):
+            self._check_sr(other)
+            y = self._writable_samples(len(other))
+            if y is None:
+                return self * other 
+            _apply_samples(y, _y_values(other._points), 'mul')
+            return self 
+        if not isinstance(other, numbers.Real):
+            return NotImplemented
+        y = self._writable_samples(0)
+        if y is None:
+            return self * other 
+        _apply_samples(y, other, 'gain')
+        return self 
+
+
+    def concat(self, *others: 'Waveform') -> 'Waveform':
+        """Join waveforms end to end into a new Waveform. The x values are recalculated 
+        so time continues across the joins.
+
+        Args:
+            *others (Waveform): The waveforms to append.
+
+        Raises:
+            ValueError: If the sample rates do not match or are unknown.
+
+        Returns:
+            Waveform: The joined waveform.
+        """
+        if self._sr is None:
+            raise ValueError('a sample rate is needed to concatenate waveforms')
+        y = array.array('d', _y_values(self._points))
+        for other in others:
+            self._check_sr(other)
+            y.extend(_y_values(other._points))
+        return Waveform(PointArray(SamplingIndex(range(len(y)), self._sr), y), self._sr)
+
+
+    def time_slice(self, start: float=0.0, stop: Optional[float]=None) -> 'Waveform':
+        """Slice the waveform by time in seconds instead of by sample.
+
+        Args:
+            start (float, optional): The start time. Defaults to 0.0.
+            stop (Optional[float], optional): The time to stop before. Defaults to None for the end.
+
+        Raises:
+            ValueError: If the waveform has no sample rate.
+
+        Returns:
+            Waveform: The samples between start and stop.
+        """
+        if self._sr is None:
+            raise ValueError('a sample rate is needed to slice by time')
+        return self[round(start * self._sr):None if stop is None else round(stop * self._sr)]
+
+
+    def resample(self, new_sr: int, quality: str='sinc', block_size: int=65536) -> 'Waveform':
+        """Convert the samples to another sample rate. The 'sinc' quality uses a polyphase 
+        windowed sinc filter that also removes frequencies above the new Nyquist frequency when 
+        downsampling, 'linear' interpolates between neighbouring samples and is much faster. 
+        The output is computed in blocks so only a block of the input is held in working 
+        memory, which keeps mapped waveforms on disk. A block holds block_size filter weights, 
+        which is block_size // (2 * taps) output samples for a filter with taps on each side.
+
+        Args:
+            new_sr (int): The new sample rate.
+            quality (str, optional): 'sinc' or 'linear'. Defaults to 'sinc'.
+            block_size (int, optional): The number of filter weights per block. Defaults to 65536.
+
+        Raises:
+            ValueError: If the waveform has no sample rate or the arguments are invalid.
+
+        Returns:
+            Waveform: The resampled waveform.
+        """
+        if self._sr is None:
+            raise ValueError('a sample rate is needed to resample')
+        if new_sr < 1 or block_size < 1:
+            raise ValueError('new_sr and block_size must be positive')
+        if quality not in ('sinc', 'linear'):
+            raise ValueError(f'unknown quality {quality}')
+        y = _y_values(self._points)
+        g = math.gcd(self._sr, new_sr)
+        up, down = new_sr // g, self._sr // g
+        n_out = len(y) * up // down
+        step = max(1, block_size // (2 * _resample_taps(up, down, quality)[2]))
+        out = array.array('d')
+        for start in range(0, n_out, step):
+            block = _resample_block(y, start, min(start + step, n_out), up, down, quality)
+            if np is not None:
+                out.frombytes(block.astype(np.float64).tobytes())
+            else:
+                out.extend(block)
+        return Waveform(PointArray(SamplingIndex(range(n_out), new_sr), out), new_sr)
+
+
+    def spectrum(self, n_fft: Optional[int]=None) -> Tuple[List[float], List[float]]:
+        """Compute the one sided amplitude spectrum of the y values with an FFT. The samples 
+        are zero padded to n_fft points and a sine of amplitude A shows up as A in its bin.
+
+        Args:
+            n_fft (Optional[int], optional): The FFT size as a power of two that is at least the 
+                number of samples. Defaults to None which uses the next power of two.
+
+        Raises:
+            ValueError: If there is no sample rate, no samples or n_fft is not a large enough power of two.
+
+        Returns:
+            Tuple[List[float], List[float]]: The frequency and the magnitude of each bin.
+        """
+        if self._sr is None:
+            raise ValueError('a sample rate is needed to compute a spectrum')
+        n = len(self)
+        if n == 0:
+            raise ValueError('cannot compute the spectrum of an empty waveform')
+        n_fft = n_fft or 1 << (n - 1).bit_length()
+        if n_fft < n or n_fft & (n_fft - 1):
+            raise ValueError('n_fft must be a power of two and at least the number of samples')
+        y = _y_values(self._points)
+        if np is not None:
+            magnitudes = np.abs(np.fft.rfft(np.fromiter(y, dtype=np.float64, count=n), n_fft)).tolist()
+        else:
+            magnitudes = [abs(value) for value in _fft(list(y) + [0.0] * (n_fft - n))[:n_fft // 2 + 1]]
+        scaled = [m * (1 if k in (0, n_fft // 2) else 2) / n for k, m in enumerate(magnitudes)]
+        return [k * self._sr / n_fft for k in range(len(scaled))], scaled
+
+
+    def dominant_frequency(self, n_fft: Optional[int]=None) -> float:
+        """Find the frequency with the largest magnitude in the spectrum, ignoring the DC bin. 
+        The peak is refined between bins with a parabola through its neighbours.
+
+        Args:
+            n_fft (Optional[int], optional): The FFT size, see `spectrum`. Defaults to None.
+
+        Returns:
+            float: The peak frequency in Hz.
+        """
+        freqs, magnitudes = self.spectrum(n_fft)
+        if len(magnitudes) < 2:
+            return 0.0
+        k = max(range(1, len(magnitudes)), key=magnitudes.__getitem__)
+        if 1 < k < len(magnitudes) - 1:
+            left, mid, right = magnitudes[k - 1], magnitudes[k], magnitudes[k + 1]
+            denom = left - 2 * mid + right
+            offset = 0.5 * (left - right) / denom if denom else 0.0
+            return freqs[k] + offset * (freqs[1] - freqs[0])
+        return freqs[k]
+
+
+    @property 
+    def nbytes(self) -> int: 
+        """The size of the sample data as two float64 values per point."""
+        return len(self._points) * 2 * array.array('d').itemsize
+
+
+    def points(self, as_type: str='objects') -> Sequence[Union[Point, Tuple, Dict]]:
         """Returns a new set of points based on the given type. Options are 'objects' 
-        to return a list of Points, 'tuples' to return a list of tuples, and 'records' to 
-        return a list of dicts. 
+        to return a list of Points, 'tuples' to return a view of tuples, and 'records' to 
+        return a view of dicts. The views convert points as they are accessed, use 
+        `PointsView.materialize` to get a list.
 
         Args:
             as_type (str, optional): The type to return. Defaults to 'objects'.
@@ -257,21 +2266,227 @@ class Waveform(object):
             ValueError: If an incorrect type string is given.
 
         Returns:
-            List[Union[Point, Tuple, Dict]]: The Waveform as a list of Points, tuples or dicts.
+            Sequence[Union[Point, Tuple, Dict]]: The Waveform as a list of Points or a view of tuples or dicts.
         """
 
         # ** we can implement this as an if-else block
-        new_points =  copy.copy(self._points)
         if as_type == 'objects': 
-            return new_points
-        elif as_type == 'tuples':
-            return [point.as_tuple() for point in new_points]
-        elif as_type == 'records':
-            return [point.as_dict() for point in new_points]
+            if isinstance(self._points, PointArray):
+                return self._points.to_objects()
+            return copy.copy(self._points)
+        elif as_type in ('tuples', 'records'):
+            return PointsView(self._points, as_type)
         else:
             raise ValueError('Incorrect type string given')
 
 
+    def to_pcm(self, buffer: BinaryIO, bit_depth: int=16, is_float: bool=False) -> int:
+        """Write the samples to a binary buffer as raw little endian PCM in a single write.
+
+        Args:
+            buffer (BinaryIO): A writable binary file-like object.
+            bit_depth (int, optional): 16, 24 or 32. Defaults to 16.
+            is_float (bool, optional): Write float32 samples. Defaults to False.
+
+        Returns:
+            int: The number of samples written.
+        """
+        return write_pcm(buffer, [self._points], bit_depth, is_float)
+
+
+    def to_wav(self, path: str, bit_depth: int=16, is_float: bool=False) -> int:
+        """Write the samples to a mono WAV file.
+
+        Args:
+            path (str): The file path.
+            bit_depth (int, optional): 16, 24 or 32. Defaults to 16.
+            is_float (bool, optional): Write float32 samples. Defaults to False.
+
+        Raises:
+            ValueError: If the Waveform has no sample rate.
+
+        Returns:
+            int: The number of samples written.
+        """
+        if self._sr is None:
+            raise ValueError('a sample rate is needed to write a wav file')
+        return write_wav(path, [self._points], self._sr, bit_depth, is_float)
+
+
+
+class WaveCache(object): 
+    """A least recently used cache of Waveforms bounded by the total bytes of their samples. 
+    Waveforms only hand out new lists from `points` so a cached Waveform can be shared 
+    between callers without copying it.
+    """
+
+    def __init__(self, max_bytes: int=64 * 1024 * 1024):
+        """Create an empty cache.
+
+        Args:
+            max_bytes (int, optional): The max total of Waveform.nbytes kept in the cache. Defaults to 64MB.
+
+        Raises:
+            ValueError: If max_bytes is negative.
+        """
+        if max_bytes < 0:
+            raise ValueError('max_bytes cannot be negative')
+        self._max_bytes = max_bytes 
+        self._entries = collections.OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+
+    def __len__(self) -> int: 
+        return len(self._entries)
+
+
+    @property 
+    def nbytes(self) -> int: 
+        return self._nbytes
+
+
+    @property 
+    def hits(self) -> int: 
+        return self._hits
+
+
+    @property 
+    def misses(self) -> int: 
+        return self._misses
+
+
+    @property 
+    def evictions(self) -> int: 
+        return self._evictions
+
+
+    def get(self, key: Tuple) -> Optional[Waveform]:
+        """Return the cached Waveform for key and mark it as recently used or None on a miss.
+
+        Args:
+            key (Tuple): The cache key.
+
+        Returns:
+            Optional[Waveform]: The cached Waveform.
+        """
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                self._misses += 1
+                return None 
+            self._hits += 1
+            return self._entries[key]
+
+
+    def put(self, key: Tuple, waveform: Waveform) -> None:
+        """Add a Waveform and evict the least recently used entries until the cache fits 
+        in max_bytes. Waveforms larger then max_bytes are never cached. Cached waveforms are 
+        frozen since every caller of `get` shares them.
+
+        Args:
+            key (Tuple): The cache key.
+            waveform (Waveform): The Waveform to cache.
+        """
+        if waveform.nbytes > self._max_bytes:
+            return 
+        waveform.freeze()
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key).nbytes
+            self._entries[key] = waveform 
+            self._nbytes += waveform.nbytes
+            while self._nbytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+                self._evictions += 1
+
+
+    def clear(self) -> None: 
+        """Remove all entries. The counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+def _render_samples(osc: Oscillator, sr: int, freq: float, dur: float, amp: float) -> array.array:
+    """Render the y values of a waveform into a float64 buffer using a copy of osc so 
+    concurrent renders never change the same oscillator.
+
+    Returns:
+        array.array: The y values.
+    """
+    osc = copy.copy(osc)
+    osc._compact = True
+    osc.set_samplerate(sr)
+    return osc.calc(freq, dur, amp).y
+
+
+def _render_shared(osc: Oscillator, sr: int, freq: float, dur: float, amp: float) -> Tuple[str, int]:
+    """Render a waveform in a worker process and copy its y values into a new shared 
+    memory block. The caller is responsible for unlinking the block.
+
+    Returns:
+        Tuple[str, int]: The name of the shared memory block and the number of samples.
+    """
+    y = _render_samples(osc, sr, freq, dur, amp)
+    shm = shared_memory.SharedMemory(create=True, size=max(len(y) * y.itemsize, 1))
+    if os.name == 'posix': # the block is tracked again when the caller attaches to it, so hand it over
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    try:
+        shm.buf[:len(y) * y.itemsize] = memoryview(y).cast('B')
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise 
+    shm.close()
+    return shm.name, len(y)
+
+
+def _read_shared(name: str, n_samples: int) -> array.array:
+    """Copy the samples out of a shared memory block and unlink it."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        y = array.array('d')
+        y.frombytes(shm.buf[:n_samples * y.itemsize])
+    finally:
+        shm.close()
+        shm.unlink()
+    return y
+
+
+def _collect_shared(futures: List[concurrent.futures.Future]) -> List[array.array]:
+    """Read and unlink the shared memory block of every render that succeeded, then raise 
+    the first error so a failed spec does not leak the blocks of the others.
+
+    Returns:
+        List[array.array]: The y values in the order of futures.
+    """
+    samples, error = [], None 
+    for future in futures:
+        try:
+            name, n_samples = future.result()
+        except Exception as err:
+            error = error or err 
+            continue 
+        samples.append(_read_shared(name, n_samples))
+    if error is not None:
+        raise error 
+    return samples 
+
+
+def _spec_args(sr: int=44100, 
+    freq: float=1.0, 
+    dur: float=1.0, 
+    amp: float=1.0, 
+    osc: Optional[Oscillator]=None) -> Tuple[Oscillator, int, float, float, float]:
+    """Fill in the defaults of `WaveFactory.create` for a spec dict."""
+    return (Sine() if osc is None else osc), sr, freq, dur, amp
+
+
 
 class WaveFactory(object): 
     """Responsible for creating a single Waveform given the osc and config. 
@@ -285,6 +2500,16 @@ class WaveFactory(object):
     In this case any subclass of Oscillator should be able to be used in this factory.
     """
 
+    def __init__(self, cache: Optional[WaveCache]=None):
+        """A factory for Waveforms. 
+
+        Args:
+            cache (Optional[WaveCache], optional): If given, `create` returns a shared Waveform 
+                for repeated configs instead of regenerating it. Defaults to None.
+        """
+        self._cache = cache 
+
+
     def create(self, 
         sr: int=44100, 
         freq: float=1.0, 
@@ -307,5 +2532,132 @@ class WaveFactory(object):
             Waveform: [description]
         """
         osc.set_samplerate(sr)
-        return Waveform(osc.calc(freq, dur, amp))
+        if self._cache is None:
+            return Waveform(osc.calc(freq, dur, amp), sr)
+        key = osc._cache_key() + (sr, freq, dur, amp)
+        waveform = self._cache.get(key)
+        if waveform is None:
+            waveform = Waveform(osc.calc(freq, dur, amp), sr)
+            self._cache.put(key, waveform)
+        return waveform
+
+
+    def create_many(self, 
+        specs: Iterable[Dict], 
+        workers: Optional[int]=None, 
+        backend: str='process') -> List[Waveform]:
+        """Produce many waveforms in parallel. Each spec is a dict of the keyword arguments 
+        of `create`. With the process backend the samples are sent back through shared 
+        memory instead of pickling points. The Waveforms hold a PointArray whatever the 
+        compact setting of the oscillators and are returned in the order of the specs.
+
+        Args:
+            specs (Iterable[Dict]): The create arguments of each waveform.
+            workers (Optional[int], optional): The number of workers. Defaults to None which uses the cpu count.
+            backend (str, optional): 'process' or 'thread'. Defaults to 'process'.
+
+        Raises:
+            ValueError: If the backend is not known.
+
+        Returns:
+            List[Waveform]: The waveforms in the same order as specs.
+        """
+        args = [_spec_args(**spec) for spec in specs]
+        srs = [spec_args[1] for spec_args in args]
+        if backend == 'process':
+            futures = []
+            try:
+                with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+                    futures.extend(executor.submit(_render_shared, *spec_args) for spec_args in args)
+            finally:
+                samples = _collect_shared(futures)
+        elif backend == 'thread':
+            with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+                samples = list(executor.map(_render_samples, *zip(*args))) if args else []
+        else:
+            raise ValueError(f'unknown backend {backend}')
+        return [Waveform(PointArray(SamplingIndex(range(len(y)), sr), y), sr) for y, sr in zip(samples, srs)]
+
+
+    async def acreate(self, 
+        sr: int=44100, 
+        freq: float=1.0, 
+        dur: float=1.0, 
+        amp: float=1.0, 
+        osc: Optional[Oscillator]=None, 
+        executor: Optional[concurrent.futures.Executor]=None) -> Waveform:
+        """Same as `create` but runs the generation in an executor so the event loop is not 
+        blocked. A copy of osc is used so concurrent calls never share an oscillator.
+
+        Args:
+            sr (int, optional): The samplerate. Defaults to 44100.
+            freq (float, optional): The frequency. Defaults to 1.0.
+            dur (float, optional): The duration. Defaults to 1.0.
+            amp (float, optional): The amplitude. Defaults to 1.0.
+            osc (Optional[Oscillator], optional): An instance of an oscilator class. Defaults to None for a Sine.
+            executor (Optional[concurrent.futures.Executor], optional): The executor to run in. 
+                Defaults to None for the loop's default thread pool.
+
+        Returns:
+            Waveform: The generated waveform.
+        """
+        osc = copy.copy(Sine() if osc is None else osc)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.create, sr, freq, dur, amp, osc)
+
+
+    async def astream(self, 
+        sr: int=44100, 
+        freq: float=1.0, 
+        dur: float=1.0, 
+        amp: float=1.0, 
+        osc: Optional[Oscillator]=None, 
+        chunk_size: int=4096, 
+        max_pending: int=2, 
+        executor: Optional[concurrent.futures.Executor]=None) -> AsyncIterator[Union[List[Point], PointArray]]:
+        """Asynchronously iterate over the chunks of `Oscillator.stream`. The chunks are 
+        generated in an executor at most max_pending ahead of the consumer, so a slow 
+        consumer pauses the generation instead of filling memory.
 
+        Args:
+            sr (int, optional): The samplerate. Defaults to 44100.
+            freq (float, optional): The frequency. Defaults to 1.0.
+            dur (float, optional): The duration. Defaults to 1.0.
+            amp (float, optional): The amplitude. Defaults to 1.0.
+            osc (Optional[Oscillator], optional): An instance of an oscilator class. Defaults to None for a Sine.
+            chunk_size (int, optional): The number of samples per chunk. Defaults to 4096.
+            max_pending (int, optional): The number of chunks generated ahead. Defaults to 2.
+            executor (Optional[concurrent.futures.Executor], optional): The executor to run in. 
+                Defaults to None for the loop's default thread pool.
+
+        Yields:
+            Union[List[Point], PointArray]: The next chunk of the waveform.
+        """
+        osc = copy.copy(Sine() if osc is None else osc)
+        osc.set_samplerate(sr)
+        chunks = osc.stream(freq, dur, amp, chunk_size)
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(max_pending)
+        done = object()
+
+        async def produce() -> None:
+            try:
+                while True:
+                    chunk = await loop.run_in_executor(executor, next, chunks, done)
+                    await queue.put(chunk)
+                    if chunk is done:
+                        return 
+            except Exception as err:
+                await queue.put(err)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is done:
+                    break 
+                if isinstance(chunk, Exception):
+                    raise chunk 
+                yield chunk 
+        finally:
+            producer.cancel()
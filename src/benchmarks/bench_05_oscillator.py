@@ -0,0 +1,255 @@
+""" A reproducible benchmark of the oscillator pipeline in `_05_oscillator`. Every stage of 
+`Oscillator.calc` and the `Waveform.points` conversions are timed on their own as well as 
+`WaveFactory.create` end to end, for each sample rate and duration in the sweep.
+
+Each case is timed `repeat` times and the best run is kept. The peak of python allocations is 
+measured in a separate run with `tracemalloc` so it does not distort the timings. The peak 
+resident set size only ever grows within a process, so by default every case runs in a fresh 
+process and reports its own peak together with how much the case itself added to it.
+
+Run it from the directory that contains the package and write the results as json:
+
+    python -m module_one.benchmarks.bench_05_oscillator --out bench.json
+
+and compare two runs, for example from two commits:
+
+    python -m module_one.benchmarks.bench_05_oscillator --compare old.json bench.json
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError: # not available on windows
+    resource = None 
+
+from module_one._05_oscillator import normalize, np, Sine, Triangle, Waveform, WaveFactory
+
+
+SAMPLE_RATES = (8000, 44100, 96000)
+DURATIONS = (1.0, 10.0, 60.0)
+FREQ = 440.0
+
+
+def _max_rss_kb() -> Optional[int]:
+    """The peak resident set size of this process in kB or None if it cannot be read."""
+    if resource is None:
+        return None 
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss # macos reports bytes
+
+
+def _git_commit() -> Optional[str]:
+    """The current commit hash or None outside of a git checkout."""
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None 
+    return out.stdout.strip()
+
+
+def time_case(func: Callable[[], object], repeat: int=3) -> Tuple[float, int]:
+    """Time a function and measure its peak allocations.
+
+    Args:
+        func (Callable[[], object]): The function to benchmark.
+        repeat (int, optional): The number of timed runs. Defaults to 3.
+
+    Returns:
+        Tuple[float, int]: The best time in seconds and the peak allocated bytes.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+STAGES = (
+    'sampling_index', 'generate_sine', 'generate_triangle', 'normalize', 'make_points', 
+    'make_points_unrounded', 'points_objects', 'points_tuples', 'points_records', 'create', 
+)
+
+
+def build_case(stage: str, sr: int, dur: float, compact: bool=False) -> Callable[[], object]:
+    """Build the function for one benchmarked stage at one sample rate and duration. Only the 
+    inputs that stage needs are computed, up front, so only the stage itself is timed and the 
+    memory of a case is not taken up by the inputs of the others.
+
+    Args:
+        stage (str): The stage name, one of STAGES.
+        sr (int): The sample rate.
+        dur (float): The duration in seconds.
+        compact (bool, optional): Run the oscillators in compact mode. Defaults to False.
+
+    Raises:
+        ValueError: If the stage is not known.
+
+    Returns:
+        Callable[[], object]: The function to time.
+    """
+    if stage not in STAGES:
+        raise ValueError(f'unknown stage {stage}')
+    sine = Sine(sr, compact)
+    if stage == 'sampling_index':
+        return lambda: sine._calculate_sampling_index(dur)
+    if stage == 'create':
+        return lambda: WaveFactory().create(sr, FREQ, dur, 1.0, Sine(compact=compact))
+    x = sine._calculate_sampling_index(dur)
+    if stage == 'generate_sine':
+        return lambda: sine._generate_waveform(x, FREQ, 1.0)
+    if stage == 'generate_triangle':
+        triangle = Triangle(sr, compact)
+        return lambda: triangle._generate_waveform(x, FREQ, 1.0)
+    y = sine._generate_waveform(x, FREQ, 1.0)
+    if stage == 'normalize':
+        return lambda: normalize(y, -1.0, 1.0)
+    if stage == 'make_points':
+        return lambda: sine._make_points(x, y)
+    if stage == 'make_points_unrounded':
+        unrounded = Sine(sr, compact, precision=None)
+        return lambda: unrounded._make_points(x, y)
+    wf = Waveform(sine._make_points(x, y), sr)
+    as_type = stage[len('points_'):]
+    if as_type == 'objects':
+        return lambda: wf.points('objects')
+    return lambda: list(wf.points(as_type))
+
+
+def run_case(stage: str, sr: int, dur: float, repeat: int=3, compact: bool=False) -> Dict:
+    """Benchmark one stage at one sample rate and duration.
+
+    Args:
+        stage (str): The stage name, one of STAGES.
+        sr (int): The sample rate.
+        dur (float): The duration in seconds.
+        repeat (int, optional): The number of timed runs. Defaults to 3.
+        compact (bool, optional): Run the oscillators in compact mode. Defaults to False.
+
+    Returns:
+        Dict: The record of the case.
+    """
+    func = build_case(stage, sr, dur, compact)
+    rss_before = _max_rss_kb()
+    seconds, peak = time_case(func, repeat)
+    rss_after = _max_rss_kb()
+    samples = int(sr * dur)
+    return {
+        'stage': stage, 
+        'sr': sr, 
+        'dur': dur, 
+        'samples': samples, 
+        'seconds': seconds, 
+        'samples_per_sec': samples / seconds if seconds else None, 
+        'peak_alloc_bytes': peak, 
+        'max_rss_kb': rss_after, 
+        'rss_increase_kb': rss_after - rss_before if rss_after is not None else None, 
+    }
+
+
+def _run_isolated(*args: object) -> Dict:
+    """Run one case in a freshly spawned process so its peak RSS is not hidden by earlier cases."""
+    with concurrent.futures.ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(run_case, *args).result()
+
+
+def run(sample_rates: Tuple[int]=SAMPLE_RATES, 
+    durations: Tuple[float]=DURATIONS, 
+    repeat: int=3, 
+    compact: bool=False, 
+    isolate: bool=True) -> Dict:
+    """Run the full sweep.
+
+    Args:
+        sample_rates (Tuple[int], optional): The sample rates. Defaults to SAMPLE_RATES.
+        durations (Tuple[float], optional): The durations in seconds. Defaults to DURATIONS.
+        repeat (int, optional): The number of timed runs per case. Defaults to 3.
+        compact (bool, optional): Run the oscillators in compact mode. Defaults to False.
+        isolate (bool, optional): Run every case in its own process. Without it `max_rss_kb` is 
+            the peak of the whole sweep so far and only `rss_increase_kb` is per case. 
+            Defaults to True.
+
+    Returns:
+        Dict: The environment and a record for each case.
+    """
+    run_one = _run_isolated if isolate else run_case
+    results = []
+    for sr in sample_rates:
+        for dur in durations:
+            for stage in STAGES:
+                results.append(run_one(stage, sr, dur, repeat, compact))
+    return {
+        'meta': {
+            'commit': _git_commit(), 
+            'python': platform.python_version(), 
+            'numpy': np.__version__ if np is not None else None, 
+            'compact': compact, 
+            'repeat': repeat, 
+            'isolate': isolate, 
+        }, 
+        'results': results, 
+    }
+
+
+def compare(old: Dict, new: Dict) -> List[Dict]:
+    """Match the cases of two runs and compute how much faster the new run is.
+
+    Args:
+        old (Dict): The baseline run.
+        new (Dict): The run to compare.
+
+    Returns:
+        List[Dict]: The stage, sr, dur and speedup (old seconds / new seconds) of each shared case.
+    """
+    key = lambda r: (r['stage'], r['sr'], r['dur'])
+    baseline = {key(r): r for r in old['results']}
+    return [
+        {'stage': r['stage'], 'sr': r['sr'], 'dur': r['dur'], 'speedup': baseline[key(r)]['seconds'] / r['seconds']} 
+        for r in new['results'] if key(r) in baseline and r['seconds']
+    ]
+
+
+def main(argv: Optional[List[str]]=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--srs', type=int, nargs='+', default=SAMPLE_RATES, help='sample rates to sweep')
+    parser.add_argument('--durations', type=float, nargs='+', default=DURATIONS, help='durations in seconds to sweep')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case')
+    parser.add_argument('--compact', action='store_true', help='run the oscillators in compact mode')
+    parser.add_argument('--no-isolate', dest='isolate', action='store_false', help='run every case in this process')
+    parser.add_argument('--out', help='write the results to this json file instead of stdout')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two result files')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f_old, open(args.compare[1]) as f_new:
+            rows = compare(json.load(f_old), json.load(f_new))
+        for row in rows:
+            print(f"{row['stage']:<18} sr={row['sr']:<6} dur={row['dur']:<6} x{row['speedup']:.2f}")
+        return 
+
+    report = run(tuple(args.srs), tuple(args.durations), args.repeat, args.compact, args.isolate)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
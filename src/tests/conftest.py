@@ -3,6 +3,7 @@ import pytest
 import json 
 from module_one._03_strmatrix import StrMatrix
 from module_one._05_oscillator import Oscillator
+import module_one._05_oscillator
 from typing import Dict, List, Tuple, Union
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -47,6 +48,19 @@ def identity_oscillator():
             amp: float) -> List[float]:
             return x
     return IdentityOscillator()
+
+
+@pytest.fixture(params=[False, True], ids=['numpy', 'no_numpy'])
+def no_numpy(request, mocker): 
+    """NOTE Runs a test once as it is and once with the optional numpy import 
+    of the oscillator module patched to None, so the pure python fallbacks are 
+    checked against the numpy code paths.
+    """
+    if request.param: 
+        mocker.patch.object(module_one._05_oscillator, 'np', None)
+    return request.param
+
+
 # waveform file loaders
 
 @pytest.fixture 
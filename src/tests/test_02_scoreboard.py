@@ -1,6 +1,12 @@
 import pytest
 import unittest
 from module_one._02_scoreboard import *
+from module_one._02_scoreboard import _SortedScores, _FrequencyIndex, _RangeIndex
+import array
+import bisect
+import collections
+import random
+import tracemalloc
 
 tc = unittest.TestCase()
 
@@ -49,7 +55,7 @@ def test_push_scores_calls_validate_score(mocker):
     test = [1,4,5,3,2]
     
     sb = Scoreboard()
-    sb._validate_score = mocker.MagicMock(return_value=test)
+    sb._validate_score = mocker.MagicMock(side_effect=lambda score: score)
     sb.push_scores(test)
 
     call_count = sb._validate_score.call_count 
@@ -256,7 +262,7 @@ def test_scoreboard_variance_calls_correct_methods(mocker):
     sb.length = mocker.MagicMock(sb.length)
 
     sb.variance()
-    sb.mean.assert_called()
+    sb.mean.assert_not_called() # the running sum of squares does not need the mean
     sb.length.assert_called_once()
 
 
@@ -300,3 +306,272 @@ def test_scoreboard_more_cases():
         solution, case = t
         s._scores = case
         assert s.median() == solution 
+
+
+
+def test_scoreboard_running_aggregates_follow_push_and_pop(stats_scores): 
+
+    sb = Scoreboard()
+    sb.push_scores(stats_scores[:10])
+    for score in stats_scores[10:]: 
+        sb.push_score(score)
+    assert sb.total() == sum(stats_scores)
+    assert round(sb.variance(), 5) == 27.42531
+    assert round(sb.stddev(), 5) == 5.31337
+
+    for _ in range(5): 
+        sb.pop_score()
+    rest = stats_scores[:-5]
+    mean = sum(rest) / len(rest)
+    assert sb.total() == sum(rest)
+    assert sb.variance() == pytest.approx(sum((s - mean)**2 for s in rest) / len(rest))
+    assert sb.variance(1) == pytest.approx(sum((s - mean)**2 for s in rest) / (len(rest) - 1))
+
+    while sb.pop_score() is not None: 
+        pass 
+    assert sb.total() == 0 
+    assert sb.variance() is None 
+    sb.push_scores([7, 7, 7])
+    assert sb.variance() == 0.0
+
+
+
+def test_scoreboard_order_statistics_follow_push_and_pop(stats_scores): 
+
+    sb = Scoreboard()
+    sb.push_scores(stats_scores)
+    ordered = sorted(stats_scores)
+
+    assert sb.median() == 3 
+    assert sb.best() == 27 and sb.worst() == 1
+    assert sb.percentile(0) == 1 and sb.percentile(100) == 27 
+    assert sb.percentile(50) == sb.median()
+    assert sb.percentile(95) == pytest.approx(ordered[32] + 0.3 * (ordered[33] - ordered[32]))
+    assert sb.rank(1) == 0
+    assert sb.rank(2) == ordered.count(1)
+    assert sb.rank(100) == len(ordered)
+
+    sb.pop_score() # 5
+    sb.pop_score() # 14
+    assert sb.best() == 27 
+    assert sb.median() == sorted(stats_scores[:-2])[16]
+    assert sb.rank(14) == bisect.bisect_left(sorted(stats_scores[:-2]), 14)
+
+    with pytest.raises(ValueError): 
+        sb.percentile(101)
+    assert Scoreboard().percentile(50) is None 
+
+
+def test_sorted_scores_matches_sorted_list_under_pushes_and_pops(): 
+
+    rng = random.Random(42)
+    index, reference = _SortedScores(load=4), []
+    for _ in range(2000): 
+        if reference and rng.random() < 0.4: 
+            score = rng.choice(reference)
+            reference.remove(score)
+            index.remove(score)
+        else: 
+            score = rng.randrange(50)
+            reference.append(score)
+            index.add(score)
+        reference.sort()
+        assert len(index) == len(reference)
+        k = rng.randrange(-len(reference), len(reference)) if reference else 0
+        if reference: 
+            assert index[k] == reference[k]
+        assert index.bisect_left(25) == bisect.bisect_left(reference, 25)
+        assert index.bisect_right(25) == bisect.bisect_right(reference, 25)
+        if rng.random() < 0.05: 
+            batch = [rng.randrange(50) for _ in range(rng.randrange(1, 30))]
+            reference = sorted(reference + batch)
+            index.update(batch)
+
+    assert [index[k] for k in range(len(index))] == reference 
+    with pytest.raises(IndexError): 
+        index[len(index)]
+    with pytest.raises(ValueError): 
+        index.remove(1000)
+
+
+def test_scoreboard_mode_and_top_k_frequent_follow_push_and_pop(stats_scores): 
+
+    sb = Scoreboard()
+    sb.push_scores(stats_scores)
+    assert sb.top_k_frequent(3) == [(2, 9), (1, 7), (5, 5)]
+    assert sb.top_k_frequent(0) == []
+    assert len(sb.top_k_frequent(100)) == len(set(stats_scores))
+
+    for _ in range(6): 
+        sb.push_score(1)
+    assert sb.mode() == (1, 13)
+    for _ in range(6): 
+        sb.pop_score()
+    assert sb.mode() == (2, 9)
+
+    sb._scores = [3, 3]
+    sb.push_score(4)
+    assert sb.top_k_frequent(2) == [(3, 2), (4, 1)]
+    sb.pop_score()
+    sb.pop_score()
+    sb.pop_score()
+    assert sb.mode() is None 
+    assert sb.top_k_frequent(1) == []
+
+    with pytest.raises(ValueError): 
+        sb.top_k_frequent(-1)
+
+
+def test_frequency_index_matches_counter_under_pushes_and_pops(): 
+
+    rng = random.Random(7)
+    stack = []
+    index = _FrequencyIndex(stack)
+    for _ in range(2000): 
+        if stack and rng.random() < 0.45: 
+            index.remove(stack.pop())
+        elif rng.random() < 0.1: 
+            start = len(stack)
+            stack.extend(rng.randrange(20) for _ in range(rng.randrange(1, 40)))
+            index.update(start)
+        else: 
+            stack.append(rng.randrange(20))
+            index.add(stack[-1], len(stack) - 1)
+        expected = collections.Counter(stack).most_common()
+        assert index.most_common(len(expected)) == expected 
+
+
+def test_frequency_index_counts_a_small_batch_without_rebuilding(mocker): 
+
+    sb = Scoreboard()
+    sb.push_scores([i % 101 for i in range(20000)])
+    build = mocker.spy(_FrequencyIndex, '_build')
+    for _ in range(5): 
+        sb.push_scores(list(range(50, 250)))
+    assert build.call_count == 0
+
+    expected = collections.Counter([i % 101 for i in range(20000)] + list(range(50, 250)) * 5).most_common()
+    assert sb.top_k_frequent(len(expected)) == expected 
+
+
+def test_scoreboard_mode_ties_resolve_the_same_on_every_push_path(): 
+
+    for scores in ([1, 2, 2, 1], [3, 1, 2, 2, 1, 3], [5, 4, 4, 5, 6, 6, 7]): 
+        one_by_one, batched, assigned = Scoreboard(), Scoreboard(), Scoreboard()
+        for score in scores: 
+            one_by_one.push_score(score)
+        batched.push_scores(scores)
+        assigned._scores = list(scores)
+        expected = collections.Counter(scores).most_common()
+        for sb in (one_by_one, batched, assigned): 
+            assert sb.mode() == expected[0]
+            assert sb.top_k_frequent(len(expected)) == expected 
+
+        for sb in (one_by_one, batched, assigned): 
+            sb.push_score(scores[-1])
+            sb.pop_score()
+            sb.pop_score()
+            assert sb.top_k_frequent(len(expected)) == collections.Counter(scores[:-1]).most_common()
+
+
+def test_scoreboard_threshold_queries_keep_insertion_order(stats_scores): 
+
+    sb = Scoreboard()
+    sb.push_scores(stats_scores)
+    for value in (-1, 0, 1, 4, 7, 14, 26, 27, 100): 
+        assert sb.greater_than(value) == [s for s in stats_scores if s > value]
+        assert sb.less_than(value) == [s for s in stats_scores if s < value]
+        assert sb.count_greater_than(value) == len(sb.greater_than(value))
+        assert sb.count_less_than(value) == len(sb.less_than(value))
+    assert sb.count_between(2, 5) == len([s for s in stats_scores if 2 <= s <= 5])
+    assert sb.count_between(5, 2) == 0
+
+    sb.pop_score()
+    sb.push_scores([30, 0])
+    expected = stats_scores[:-1] + [30, 0]
+    assert sb.greater_than(15) == [s for s in expected if s > 15]
+    assert sb.less_than(1) == [0]
+    assert sb.count_between(0, 1) == expected.count(0) + expected.count(1)
+
+
+def test_range_index_matches_comprehensions_under_pushes_and_pops(): 
+
+    rng = random.Random(3)
+    index, reference = _RangeIndex(), []
+    for _ in range(1000): 
+        if reference and rng.random() < 0.4: 
+            reference.pop()
+            index.pop()
+        else: 
+            batch = [rng.randrange(100) for _ in range(rng.choice((1, 1, 5)))]
+            reference.extend(batch)
+            index.extend(batch)
+        value = rng.randrange(100)
+        assert index.greater_than(value) == [s for s in reference if s > value]
+        assert index.less_than(value) == [s for s in reference if s < value]
+
+
+def test_compact_scoreboard_matches_list_scoreboard(stats_scores): 
+
+    sb, compact = Scoreboard(), Scoreboard(compact=True)
+    for board in (sb, compact): 
+        board.push_scores(stats_scores[:20])
+        for score in stats_scores[20:]: 
+            board.push_score(score)
+        board.pop_score()
+
+    assert isinstance(compact._scores, array.array) and compact._scores.itemsize == 8
+    assert compact._scores.tolist() == sb._scores
+    for method, args in [('total', ()), ('mean', ()), ('median', ()), ('mode', ()), ('variance', ()), 
+            ('stddev', ()), ('best', ()), ('worst', ()), ('top', (5,)), ('bottom', (5,)), ('get_score', (3,)), 
+            ('greater_than', (6,)), ('less_than', (2,)), ('percentile', (90,)), ('count_between', (2, 5))]: 
+        assert getattr(compact, method)(*args) == getattr(sb, method)(*args), method
+    assert type(compact.top(3)) is list 
+
+    with pytest.raises(ScoreValidationError): 
+        compact.push_score(MAX_COMPACT_SCORE + 1)
+    sb.push_score(MAX_COMPACT_SCORE + 1)
+    assert sb.best() == MAX_COMPACT_SCORE + 1
+
+    compact._scores = [3, 1, 2]
+    assert compact.median() == 2 and compact.pop_score() == 2
+
+
+def test_compact_scoreboard_sorts_once_per_order_statistic(mocker, stats_scores): 
+
+    sb, compact = Scoreboard(), Scoreboard(compact=True)
+    sb.push_scores(stats_scores + [3])
+    compact.push_scores(stats_scores + [3])
+    sorted_spy = mocker.patch('module_one._02_scoreboard.sorted', side_effect=sorted, create=True)
+    for p in (0, 1, 33.3, 50, 90, 99.9, 100): 
+        sorted_spy.reset_mock()
+        assert compact.percentile(p) == sb.percentile(p), p
+        assert sorted_spy.call_count <= 1
+    sorted_spy.reset_mock()
+    assert compact.median() == sb.median()
+    assert sorted_spy.call_count == 1
+
+    two = Scoreboard(compact=True)
+    two.push_scores([5, 2])
+    assert two.median() == 3.5 and two.percentile(25) == 2.75
+    assert compact._sorted.pair(0) == sb._sorted.pair(0) and compact._sorted.pair(-2) == sb._sorted.pair(-2)
+    with pytest.raises(IndexError): 
+        compact._sorted.pair(len(compact._stack) - 1)
+
+
+
+def test_compact_scoreboard_costs_8_bytes_per_score(): 
+
+    scores = list(range(50000)) # distinct scores are the worst case for the indexes
+    sizes = {}
+    for compact in (True, False): 
+        tracemalloc.start()
+        sb = Scoreboard(compact=compact)
+        sb.push_scores(scores)
+        sizes[compact] = tracemalloc.get_traced_memory()[0] / len(scores)
+        tracemalloc.stop()
+        assert sb.length() == len(scores)
+        del sb 
+
+    assert sizes[True] < 9
+    assert sizes[False] > 4 * sizes[True]
@@ -1,7 +1,20 @@
 import pytest 
 
-from module_one._05_oscillator import normalize, assure_positive,\
-    Point, Sine, Triangle, Waveform, WaveFactory
+import array
+import asyncio
+import concurrent.futures
+import copy
+import fractions
+import io
+import os
+import math
+import pickle
+import random
+import wave
+
+from module_one._05_oscillator import normalize, normalize_inplace, assure_positive, RunningBounds,\
+    Point, PointArray, PointsView, Sine, Triangle, Pulse, Square, Sawtooth, WhiteNoise, PinkNoise, Wavetable, Waveform, WaveCache, WaveFactory, StageProfiler, write_pcm, write_wav, \
+    ADSR, AmplitudeModulation, FrequencyModulation
 
 import module_one._05_oscillator
 
@@ -13,6 +26,44 @@ def test_osc_normalize_returns_expected():
 
 
 
+def test_osc_normalize_inplace_matches_normalize(no_numpy): 
+
+    x = [1.0, 2.1, 3.2, 4.0, 5.4]
+    buf = array.array('d', x)
+
+    assert normalize_inplace(buf, -1, 1) is buf
+    assert buf.tolist() == normalize(x, -1, 1)
+    assert normalize_inplace(list(x), -1, 1, (0.0, 5.4)) == normalize(x, -1, 1, (0.0, 5.4))
+
+    with pytest.raises(ZeroDivisionError): 
+        normalize([2.0, 2.0], -1, 1)
+    for constant in ([2.0, 2.0], array.array('d', [2.0, 2.0])): 
+        with pytest.raises(ZeroDivisionError): 
+            normalize_inplace(constant, -1, 1)
+    for compact in (False, True): 
+        with pytest.raises(ZeroDivisionError): 
+            Sine(sr=10, compact=compact).calc(freq=0.0, amp=2.0)
+
+
+def test_running_bounds_tracks_min_and_max(): 
+
+    bounds = RunningBounds()
+    assert not bounds 
+
+    bounds.update([3.0, 1.0]).update(array.array('d', [2.0, 5.0])).update([])
+    assert bounds 
+    assert bounds.bounds == (1.0, 5.0)
+
+
+def test_osc_calc_does_not_normalize_x_in_place(identity_oscillator): 
+
+    osc = identity_oscillator
+    osc._sr = 2
+    points = osc.calc(dur=2.0)
+
+    assert [p.as_tuple() for p in points] == [(0.0, -1.0), (0.5, -0.33333), (1.0, 0.33333), (1.5, 1.0)]
+
+
 def test_osc_assure_positive():
 
     args = [-1.0, 1.0, -2.0, 2.0]
@@ -30,6 +81,35 @@ def test_point_converts_to_correct_types():
     assert p.as_dict() == {'x': 1.0, 'y': 1.0}
 
 
+def test_point_is_immutable_and_slotted(): 
+
+    p = Point(1.0, 2.0)
+
+    with pytest.raises(AttributeError): 
+        p.x = 3.0
+    with pytest.raises(AttributeError): 
+        p._y = 3.0
+    with pytest.raises(AttributeError): 
+        del p._x
+    assert p.x == 1.0
+    assert not hasattr(p, '__dict__')
+    assert p == Point(1.0, 2.0)
+    assert len({p, Point(1.0, 2.0)}) == 1
+    assert pickle.loads(pickle.dumps(p)) == p
+
+
+def test_point_array_converts_points(): 
+
+    pa = PointArray.from_points([Point(1.0, 3.0), Point(2.0, 4.0)])
+
+    assert pa[0] == Point(1.0, 3.0)
+    assert pa.as_tuple(-1) == (2.0, 4.0)
+    assert pa.as_dict(0) == {'x': 1.0, 'y': 3.0}
+    assert pa.to_tuples() == [(1.0, 3.0), (2.0, 4.0)]
+    assert pa.to_records() == [{'x': 1.0, 'y': 3.0}, {'x': 2.0, 'y': 4.0}]
+    assert pa.to_objects() == [Point(1.0, 3.0), Point(2.0, 4.0)]
+
+
 def test_oscillator_can_make_points(identity_oscillator):  
 
     osc = identity_oscillator
@@ -77,7 +157,7 @@ def test_oscillator_makes_correct_calls_with_default_input(mocker, identity_osci
 
     osc = identity_oscillator
 
-    normalize_spy = mocker.spy(module_one._05_oscillator, 'normalize') # assert not called
+    normalize_spy = mocker.spy(module_one._05_oscillator, 'normalize_inplace') # assert not called
     assure_pos_spy = mocker.spy(module_one._05_oscillator, 'assure_positive')
     samp_idx_spy = mocker.spy(osc, '_calculate_sampling_index')
     gen_wavefrom_spy = mocker.spy(osc, '_generate_waveform')
@@ -103,13 +183,14 @@ def test_oscillator_makes_correct_calls_with_default_input(mocker, identity_osci
 def test_oscillator_calls_normalized_with_out_of_bounds_input(mocker, identity_oscillator): 
     
     osc = identity_oscillator
-    normalize_spy = mocker.spy(module_one._05_oscillator, 'normalize')
+    normalize_spy = mocker.spy(module_one._05_oscillator, 'normalize_inplace')
 
     fake_data = [42.0,42.0,-42.0]
     osc._generate_waveform = mocker.MagicMock(osc._generate_waveform, return_value=fake_data)
     osc.calc()
 
-    normalize_spy.assert_called_once_with(fake_data, -1.0, 1.0)
+    normalize_spy.assert_called_once_with(fake_data, -1.0, 1.0, (-42.0, 42.0))
+    assert fake_data == [1.0, 1.0, -1.0]
 
 
 
@@ -132,6 +213,129 @@ def test_triangle_osc_calc_generates_correct_waveform(triangle_wave):
     assert triangle_wave == data
 
 
+@pytest.mark.parametrize('osc_class, wave_fixture', [(Sine, 'sine_wave'), (Triangle, 'triangle_wave')])
+@pytest.mark.parametrize('compact', [False, True])
+def test_osc_calc_matches_fixture_without_numpy(mocker, request, osc_class, wave_fixture, compact): 
+
+    mocker.patch.object(module_one._05_oscillator, 'np', None)
+    osc = osc_class(sr=1000, compact=compact)
+
+    assert Waveform(osc.calc()).points('records') == request.getfixturevalue(wave_fixture)
+
+
+@pytest.mark.parametrize('amp', [1.0, 3.0])
+@pytest.mark.parametrize('compact', [False, True])
+def test_osc_stream_concatenates_to_calc(amp, compact): 
+
+    osc = Sine(sr=1000, compact=compact)
+    expected = [p.as_tuple() for p in osc.calc(3.0, 1.0, amp)]
+
+    chunks = list(osc.stream(3.0, 1.0, amp, chunk_size=128))
+    assert [len(chunk) for chunk in chunks] == [128] * 7 + [104]
+    assert [p.as_tuple() for chunk in chunks for p in chunk] == expected
+
+
+def test_osc_calc_normalizes_y_values_with_large_amp(): 
+
+    points = Sine(sr=1000).calc(amp=3.0)
+
+    assert max(p.y for p in points) == 1.0
+    assert min(p.y for p in points) == -1.0
+    assert points[1].x == 0.001
+
+
+def test_osc_stream_raises_on_bad_input(identity_oscillator): 
+
+    osc = identity_oscillator
+    osc._sr = 10
+    with pytest.raises(ValueError): 
+        next(osc.stream(chunk_size=0))
+
+
+def test_osc_stream_normalizes_unbounded_oscillators_like_calc(identity_oscillator, mocker): 
+
+    osc = identity_oscillator
+    osc._sr = 10
+    expected = [p.as_tuple() for p in osc.calc(dur=3.0)]
+    assert max(y for _, y in expected) == 1.0
+
+    chunks = list(osc.stream(dur=3.0, chunk_size=4))
+    assert [p.as_tuple() for chunk in chunks for p in chunk] == expected 
+
+    bounds_spy = mocker.spy(Sine, '_stream_bounds')
+    list(Sine(sr=100).stream(3.0))
+    list(Sine(sr=100).pipe(ADSR(), AmplitudeModulation(Triangle(), 4.0)).stream(3.0))
+    assert bounds_spy.call_count == 0
+    list(Sine(sr=100).pipe(AmplitudeModulation(Wavetable(Sine(), interpolation='cubic'), 4.0)).stream(3.0))
+    assert bounds_spy.call_count == 1
+
+
+def test_wavetable_error_is_bounded(no_numpy): 
+
+    linear = Wavetable(Sine(), size=1024)
+    cubic = Wavetable(Sine(), size=1024, interpolation='cubic')
+
+    assert linear.max_error() < 1e-5
+    assert cubic.max_error() < linear.max_error()
+    assert Wavetable(Triangle(), size=1024).max_error() < 1e-12
+
+
+def test_wavetable_works_in_the_factory(sine_wave): 
+
+    wf = WaveFactory().create(sr=1000, osc=Wavetable(Sine(), interpolation='cubic'))
+
+    for p, expected in zip(wf.points('records'), sine_wave): 
+        assert p['x'] == expected['x']
+        assert abs(p['y'] - expected['y']) <= 1e-5
+
+
+def test_wavetable_raises_on_bad_config(): 
+
+    with pytest.raises(ValueError): 
+        Wavetable(Sine(), size=2)
+    with pytest.raises(ValueError): 
+        Wavetable(Sine(), interpolation='nearest')
+
+
+@pytest.mark.parametrize('osc_class', [Square, Sawtooth, lambda sr: Pulse(0.25, sr), WhiteNoise, PinkNoise])
+def test_new_oscillators_match_without_numpy(mocker, osc_class): 
+
+    expected = WaveFactory().create(8000, 440.0, 0.1, 0.5, osc_class(sr=8000)).points('tuples')
+    mocker.patch.object(module_one._05_oscillator, 'np', None)
+    actual = WaveFactory().create(8000, 440.0, 0.1, 0.5, osc_class(sr=8000)).points('tuples')
+
+    assert len(actual) == 800
+    for (x0, y0), (x1, y1) in zip(expected, actual): 
+        assert x0 == x1
+        assert abs(y0 - y1) <= 1e-5
+        assert -0.5 <= y1 <= 0.5
+
+
+def test_band_limited_oscillators_smooth_the_edges(): 
+
+    saw = Sawtooth(sr=100)._generate_waveform([0.0, 0.1, 0.5, 0.99], 1.0, 1.0)
+    assert saw[0] == 0.0 # half way through the reset instead of -1
+    assert saw[1:3] == [-0.8, 0.0]
+
+    square = Square(sr=100)._generate_waveform([0.25, 0.5, 0.75], 1.0, 1.0)
+    assert square == [1.0, 0.0, -1.0]
+
+    with pytest.raises(ValueError): 
+        Pulse(width=1.0)
+
+
+@pytest.mark.parametrize('osc_class', [WhiteNoise, PinkNoise])
+def test_noise_is_seeded_and_streams(osc_class): 
+
+    osc = osc_class(seed=7, sr=1000, compact=True)
+    calc = osc.calc().to_tuples()
+
+    assert calc == [p.as_tuple() for p in osc_class(seed=7, sr=1000).calc()]
+    assert calc == [p for chunk in osc.stream(chunk_size=300) for p in chunk.to_tuples()]
+    assert calc != osc_class(seed=8, sr=1000, compact=True).calc().to_tuples()
+    assert abs(sum(y for _, y in calc) / len(calc)) < 0.1
+
+
 def test_waveform_returns_specified_types(): 
 
     points = [ 
@@ -155,6 +359,25 @@ def test_waveform_returns_specified_types():
         {'x': 3.0, 'y': 3.0},
     ]
 
+@pytest.mark.parametrize('points', [
+    [Point(1.0, 3.0), Point(2.0, 4.0)], 
+    PointArray([1.0, 2.0], [3.0, 4.0])
+])
+def test_waveform_points_returns_lazy_views(points): 
+
+    wf = Waveform(points)
+    tuples = wf.points('tuples')
+    records = wf.points('records')
+
+    assert isinstance(tuples, PointsView)
+    assert tuples[-1] == (2.0, 4.0)
+    assert records[0] == {'x': 1.0, 'y': 3.0}
+    assert records[1:] == [{'x': 2.0, 'y': 4.0}]
+    assert tuples.materialize() == [(1.0, 3.0), (2.0, 4.0)]
+    assert isinstance(records.materialize(), list)
+    assert tuples != [(1.0, 3.0)]
+
+
 def test_waveform_raies_error_on_invalid_type(): 
 
     wf = Waveform([]) 
@@ -175,3 +398,553 @@ def test_wavefactory_makes_correct_calls(mocker):
 
     set_sr_spy.assert_called_once_with(42)
     calc_spy.assert_called_once_with(1,2,3)
+
+
+def test_point_array_builds_points_on_demand(): 
+
+    pa = PointArray([1.0, 2.0, 3.0], [4.0, 5.0, 6.0])
+
+    assert isinstance(pa.x, array.array)
+    assert isinstance(pa.y, array.array)
+    assert len(pa) == 3
+    assert pa[1].as_tuple() == (2.0, 5.0)
+    assert len(pa[1:]) == 2
+    assert [p.as_tuple() for p in pa] == [(1.0, 4.0), (2.0, 5.0), (3.0, 6.0)]
+
+    with pytest.raises(ValueError): 
+        PointArray([1.0], [])
+
+
+def test_compact_osc_calc_matches_fixture(sine_wave): 
+
+    osc = Sine(sr=1000, compact=True)
+    points = osc.calc()
+
+    assert isinstance(points, PointArray)
+    assert Waveform(points).points('records') == sine_wave
+
+
+def test_waveform_returns_specified_types_from_point_array(): 
+
+    wf = Waveform(PointArray([1.0, 2.0], [3.0, 4.0]))
+
+    assert [p.as_tuple() for p in wf.points()] == [(1.0, 3.0), (2.0, 4.0)]
+    assert wf.points('tuples') == [(1.0, 3.0), (2.0, 4.0)]
+    assert wf.points('records') == [{'x': 1.0, 'y': 3.0}, {'x': 2.0, 'y': 4.0}]
+
+    with pytest.raises(ValueError): 
+        wf.points('something')
+
+
+def test_wavefactory_returns_cached_waveforms(mocker): 
+
+    osc = Sine()
+    calc_spy = mocker.spy(osc, 'calc')
+    cache = WaveCache()
+    factory = WaveFactory(cache)
+
+    first = factory.create(100, 1, 1, 1, osc)
+    assert factory.create(100, 1, 1, 1, osc) is first
+    assert factory.create(100, 1, 1, 1, Triangle()) is not first
+    assert factory.create(100, 2, 1, 1, osc) is not first
+
+    assert calc_spy.call_count == 2
+    assert (cache.hits, cache.misses, len(cache)) == (1, 3, 3)
+    assert cache.nbytes == 3 * 100 * 16
+
+
+def test_wavefactory_cache_keys_nested_oscillators_by_sample_rate(): 
+
+    factory = WaveFactory(WaveCache())
+    for low, high in ((Wavetable(WhiteNoise(sr=100)), Wavetable(WhiteNoise(sr=50000))), 
+        (Sine().pipe(AmplitudeModulation(Square(sr=100), 7.0)), Sine().pipe(AmplitudeModulation(Square(sr=40000), 7.0)))): 
+        first = factory.create(1000, 3.0, 1.0, 1.0, low)
+        second = factory.create(1000, 3.0, 1.0, 1.0, high)
+        assert second is not first 
+        assert second.points('tuples') == WaveFactory().create(1000, 3.0, 1.0, 1.0, high).points('tuples')
+
+
+def test_wave_cache_evicts_least_recently_used(): 
+
+    cache = WaveCache(max_bytes=2 * 16 * 10)
+    wf = {key: Waveform([Point(0.0, 0.0)] * 10) for key in 'abc'}
+
+    cache.put(('a',), wf['a'])
+    cache.put(('b',), wf['b'])
+    assert cache.get(('a',)) is wf['a']
+    cache.put(('c',), wf['c'])
+
+    assert cache.get(('b',)) is None 
+    assert cache.get(('a',)) is wf['a']
+    assert cache.evictions == 1
+    assert cache.nbytes == 2 * 16 * 10
+
+    cache.put(('d',), Waveform([Point(0.0, 0.0)] * 100))
+    assert cache.get(('d',)) is None 
+
+    with pytest.raises(ValueError): 
+        WaveCache(-1)
+
+
+@pytest.mark.parametrize('bit_depth', [16, 24, 32])
+def test_waveform_writes_int_wav(tmp_path, no_numpy, bit_depth): 
+
+    wf = Waveform(PointArray([0.0, 0.1, 0.2, 0.3], [0.0, 1.0, -1.0, 2.0]), sr=10)
+    fp = str(tmp_path / 'out.wav')
+
+    assert wf.to_wav(fp, bit_depth) == 4
+
+    with wave.open(fp, 'rb') as w: 
+        assert (w.getframerate(), w.getnchannels(), w.getsampwidth(), w.getnframes()) == (10, 1, bit_depth // 8, 4)
+        frames = w.readframes(4)
+    width = bit_depth // 8
+    top = 2 ** (bit_depth - 1) - 1
+    assert [int.from_bytes(frames[i:i + width], 'little', signed=True) for i in range(0, len(frames), width)] == [0, top, -top, top]
+
+
+def test_waveform_writes_float_pcm(): 
+
+    wf = Waveform([Point(0.0, 0.5), Point(0.1, -0.25)])
+    buf = io.BytesIO()
+
+    assert wf.to_pcm(buf, 32, is_float=True) == 2
+    assert array.array('f', buf.getvalue()).tolist() == [0.5, -0.25]
+
+    with pytest.raises(ValueError): 
+        wf.to_pcm(buf, 16, is_float=True)
+    with pytest.raises(ValueError): 
+        wf.to_pcm(buf, 8)
+    with pytest.raises(ValueError): 
+        wf.to_wav('out.wav')
+
+
+def test_write_wav_streams_chunks(tmp_path): 
+
+    osc = Sine(sr=1000, compact=True)
+    fp = str(tmp_path / 'out.wav')
+    assert write_wav(fp, osc.stream(chunk_size=300), 1000) == 1000
+
+    buf = io.BytesIO()
+    WaveFactory().create(1000, osc=osc).to_pcm(buf)
+    with wave.open(fp, 'rb') as w: 
+        assert w.readframes(1000) == buf.getvalue()
+
+
+@pytest.mark.parametrize('bit_depth, is_float', [(8, False), (16, True), (24, True)])
+def test_write_wav_checks_the_format_before_creating_the_file(tmp_path, bit_depth, is_float): 
+
+    fp = str(tmp_path / 'out.wav')
+    with pytest.raises(ValueError): 
+        write_wav(fp, [], 10, bit_depth=bit_depth, is_float=is_float)
+    assert not os.path.exists(fp)
+    with pytest.raises(ValueError): 
+        write_pcm(io.BytesIO(), [], bit_depth, is_float)
+
+
+def test_waveform_opens_raw_samples(tmp_path, no_numpy): 
+
+    fp = str(tmp_path / 'out.raw')
+    with open(fp, 'wb') as f: 
+        array.array('d', [0.0, 2.0, 4.0, -4.0]).tofile(f)
+
+    wf = Waveform.open(fp, sr=10)
+    assert wf.sr == 10
+    assert wf.points('tuples') == [(0.0, 0.0), (0.1, 2.0), (0.2, 4.0), (0.3, -4.0)]
+    assert wf[1:3].points('tuples') == [(0.1, 2.0), (0.2, 4.0)]
+    assert wf[1:].normalized().points('tuples') == [(0.1, 0.5), (0.2, 1.0), (0.3, -1.0)]
+    assert wf._points._y[::2].bounds() == (0.0, 4.0)
+    assert wf._points._y[::-1].bounds() == (-4.0, 4.0)
+    with pytest.raises(ValueError): 
+        wf[::2]
+
+    with pytest.raises(ValueError): 
+        Waveform.open(fp)
+    with pytest.raises(ValueError): 
+        Waveform.open(fp, mode='w', sr=10)
+
+
+def test_waveform_normalized_returns_new_waveform(): 
+
+    wf = Waveform([Point(0.0, 2.0), Point(1.0, 4.0)], sr=1)
+
+    assert wf.normalized().points('tuples') == [(0.0, -1.0), (1.0, 1.0)]
+    assert wf.points('tuples') == [(0.0, 2.0), (1.0, 4.0)]
+
+
+@pytest.mark.parametrize('bit_depth, is_float', [(16, False), (32, False), (32, True)])
+def test_waveform_opens_wav_files(tmp_path, bit_depth, is_float): 
+
+    fp = str(tmp_path / 'out.wav')
+    wf = WaveFactory().create(1000, 3.0, 0.5, 1.0, Sine(compact=True))
+    wf.to_wav(fp, bit_depth, is_float)
+
+    mapped = Waveform.open(fp)
+    assert mapped.sr == 1000
+    assert len(mapped) == 500
+    for expected, actual in zip(wf.points('tuples'), mapped.points('tuples')): 
+        assert expected[0] == actual[0]
+        assert abs(expected[1] - actual[1]) < 1e-4
+
+    with pytest.raises(ValueError): 
+        wf.to_wav(fp, 24)
+        Waveform.open(fp)
+
+
+@pytest.mark.parametrize('backend', ['process', 'thread'])
+def test_wavefactory_creates_many_in_order(backend): 
+
+    specs = [
+        {'sr': 1000, 'freq': 3.0, 'osc': Sine()}, 
+        {'sr': 500, 'dur': 0.5, 'amp': 2.0, 'osc': Triangle()}, 
+        {'sr': 100},
+    ]
+    factory = WaveFactory()
+
+    waveforms = factory.create_many(specs, workers=2, backend=backend)
+    for spec, waveform in zip(specs, waveforms): 
+        expected = factory.create(**spec)
+        assert waveform.sr == expected.sr
+        assert waveform.points('tuples') == expected.points('tuples')
+
+    assert factory.create_many([], backend=backend) == []
+    with pytest.raises(ValueError): 
+        factory.create_many(specs, backend='gpu')
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason='needs /dev/shm to list shared memory blocks')
+def test_wavefactory_create_many_unlinks_shared_memory_on_failure(): 
+
+    def blocks(): 
+        return {name for name in os.listdir('/dev/shm') if name.startswith('psm_')}
+
+    before = blocks()
+    specs = [{'sr': 100, 'freq': float(i)} for i in range(6)] + [{'sr': 0}] # sr 0 fails in the worker
+    with pytest.raises(ValueError): 
+        WaveFactory().create_many(specs, workers=2)
+    assert blocks() - before == set()
+
+
+def test_waveform_mixes_and_modulates(no_numpy): 
+
+    a = Waveform(PointArray([0.0, 0.5, 1.0], [1.0, 2.0, 3.0]), sr=2)
+    b = Waveform([Point(0.0, 0.5), Point(0.5, 0.5)], sr=2)
+
+    assert (a + b).points('tuples') == [(0.0, 1.5), (0.5, 2.5), (1.0, 3.0)]
+    assert (b + a).points('tuples') == (a + b).points('tuples')
+    assert sum([a, b, b]).points('tuples') == [(0.0, 2.0), (0.5, 3.0), (1.0, 3.0)]
+    assert (a * b).points('tuples') == [(0.0, 0.5), (0.5, 1.0), (1.0, 0.0)]
+    assert (2 * a).points('tuples') == [(0.0, 2.0), (0.5, 4.0), (1.0, 6.0)]
+    assert (a * fractions.Fraction(1, 2)).points('tuples') == [(0.0, 0.5), (0.5, 1.0), (1.0, 1.5)]
+    if module_one._05_oscillator.np is not None: 
+        assert (a * module_one._05_oscillator.np.float32(2.0)).points('tuples') == (2 * a).points('tuples')
+    assert a.points('tuples') == [(0.0, 1.0), (0.5, 2.0), (1.0, 3.0)]
+
+    y = a._points.y
+    a += b
+    a *= 2
+    assert a._points.y is y 
+    assert a.points('tuples') == [(0.0, 3.0), (0.5, 5.0), (1.0, 6.0)]
+
+    b += a
+    assert b.points('tuples') == [(0.0, 3.5), (0.5, 5.5), (1.0, 6.0)]
+
+    with pytest.raises(ValueError): 
+        a + Waveform([], sr=3)
+    with pytest.raises(TypeError): 
+        a * 'loud'
+
+
+def test_waveform_inplace_ops_do_not_change_cached_waveforms(): 
+
+    factory = WaveFactory(WaveCache())
+    w = factory.create(100, 1, osc=Sine(sr=100, compact=True))
+    expected = w.points('tuples')
+    assert w.frozen 
+
+    w *= 0.0
+    w += factory.create(100, 1, osc=Sine(sr=100, compact=True))
+    assert factory.create(100, 1, osc=Sine(sr=100, compact=True)).points('tuples') == expected 
+    assert not w.frozen 
+    assert w.points('tuples') == expected 
+
+
+def test_waveform_concats_and_slices_by_time(): 
+
+    a = WaveFactory().create(10, 1.0, 1.0, 1.0, Sine())
+    b = WaveFactory().create(10, 1.0, 0.5, 1.0, Triangle(compact=True))
+
+    joined = a.concat(b)
+    assert len(joined) == 15
+    assert joined[14].x == 1.4
+    assert [y for _, y in joined.points('tuples')] == [p.y for p in a.points()] + [p.y for p in b.points()]
+
+    assert a.time_slice(0.2, 0.5).points('tuples') == a.points('tuples')[2:5]
+    assert len(a.time_slice(0.5)) == 5
+
+    with pytest.raises(ValueError): 
+        a.concat(WaveFactory().create(20))
+    with pytest.raises(ValueError): 
+        Waveform([]).time_slice(1.0)
+
+
+def test_waveform_spectrum_finds_the_tone(no_numpy): 
+
+    wf = WaveFactory().create(1024, 64.0, 1.0, 0.5, Sine(compact=True))
+
+    freqs, magnitudes = wf.spectrum()
+    assert len(freqs) == len(magnitudes) == 513
+    assert freqs[64] == 64.0
+    assert magnitudes[64] == pytest.approx(0.5, abs=1e-4)
+    assert max(magnitudes[:64] + magnitudes[65:]) < 1e-4
+
+    assert WaveFactory().create(1000, 123.0, 1.0, 1.0, Sine()).dominant_frequency() == pytest.approx(123.0, abs=0.5)
+    assert WaveFactory().create(1000, 40.0, 1.0, 1.0, Triangle()).dominant_frequency() == pytest.approx(40.0, abs=0.5)
+
+
+def test_waveform_spectrum_raises_on_bad_input(): 
+
+    with pytest.raises(ValueError): 
+        Waveform([Point(0.0, 1.0)]).spectrum()
+    with pytest.raises(ValueError): 
+        Waveform([], sr=10).spectrum()
+    with pytest.raises(ValueError): 
+        WaveFactory().create(10).spectrum(12)
+
+
+def test_stage_profiler_records_calc_stages(): 
+
+    calls = []
+    with StageProfiler(hook=lambda *args: calls.append(args)) as profiler: 
+        WaveFactory().create(1000, 1.0, 1.0, 2.0, Sine())
+        WaveFactory().create(1000, 1.0, 1.0, 1.0, Sine())
+        Triangle(sr=100).calc()
+
+    WaveFactory().create(1000, osc=Sine())
+    assert module_one._05_oscillator._profiler is None 
+
+    sine = profiler.stats(Sine)
+    assert set(sine) == {'sampling_index', 'generate_waveform', 'bounds', 'normalize', 'round', 'points'}
+    assert sine['generate_waveform']['calls'] == 2
+    assert sine['normalize']['calls'] == 1
+    assert sine['points']['allocated_bytes'] > 0
+    assert sine['round']['seconds'] > 0
+    assert set(profiler.stats()) == {Sine, Triangle}
+    assert len(calls) == 11 + 5
+    assert calls[0][:2] == (Sine, 'sampling_index')
+
+    profiler.reset()
+    assert profiler.stats() == {}
+
+
+def test_stage_profiler_only_records_the_entering_thread(): 
+
+    with StageProfiler(trace_memory=False) as profiler: 
+        WaveFactory().create(100, osc=Sine())
+        with concurrent.futures.ThreadPoolExecutor(4) as pool: 
+            waves = list(pool.map(lambda _: WaveFactory().create(100, osc=Sine()), range(8)))
+
+    assert all(len(wf) == 100 for wf in waves)
+    sine = profiler.stats(Sine)
+    assert sine['generate_waveform']['calls'] == 1
+    assert all(totals['calls'] == 1 for totals in sine.values())
+
+
+def test_wavefactory_acreate_runs_concurrently(): 
+
+    factory = WaveFactory(WaveCache())
+
+    async def render(): 
+        return await asyncio.gather(*[factory.acreate(1000, freq, 1.0, 1.0, Sine()) for freq in (1.0, 2.0, 1.0)])
+
+    waveforms = asyncio.run(render())
+    assert waveforms[0].points('tuples') == factory.create(1000, 1.0, 1.0, 1.0, Sine()).points('tuples')
+    assert waveforms[1].points('tuples') == factory.create(1000, 2.0, 1.0, 1.0, Sine()).points('tuples')
+
+
+def test_wavefactory_astream_yields_chunks_with_backpressure(): 
+
+    generated = []
+
+    class CountingSine(Sine): 
+        def _generate_waveform(self, x, freq, amp): 
+            generated.append(len(x))
+            return super()._generate_waveform(x, freq, amp)
+
+    osc = CountingSine(compact=True)
+
+    async def consume(limit=None): 
+        chunks = []
+        async for chunk in WaveFactory().astream(1000, 3.0, 1.0, 2.0, osc, chunk_size=128, max_pending=1): 
+            chunks.append(chunk)
+            await asyncio.sleep(0)
+            if limit and len(chunks) == limit: 
+                break 
+        return chunks 
+
+    chunks = asyncio.run(consume())
+    assert [p for chunk in chunks for p in chunk.to_tuples()] == WaveFactory().create(1000, 3.0, 1.0, 2.0, osc).points('tuples')
+
+    generated.clear()
+    assert len(asyncio.run(consume(limit=2))) == 2
+    # 8 chunks for the bounds pass of amp > 1, then 2 consumed, 1 queued and 1 in flight out of 8
+    assert len(generated) <= 8 + 4
+
+    async def fail(): 
+        return [chunk async for chunk in WaveFactory().astream(chunk_size=0)]
+
+    with pytest.raises(ValueError): 
+        asyncio.run(fail())
+
+
+@pytest.mark.parametrize('quality, tolerance', [('sinc', 1e-3), ('linear', 1e-2)])
+@pytest.mark.parametrize('new_sr', [1500, 441])
+def test_waveform_resamples_to_new_rate(no_numpy, quality, tolerance, new_sr): 
+
+    wf = WaveFactory().create(1000, 5.0, 1.0, 0.5, Sine(compact=True))
+    expected = WaveFactory().create(new_sr, 5.0, 1.0, 0.5, Sine())
+
+    resampled = wf.resample(new_sr, quality, block_size=100)
+    assert resampled.sr == new_sr
+    assert len(resampled) == len(expected)
+
+    edge = new_sr // 20 # the filter fades in and out over the first and last few samples
+    for (x0, y0), (x1, y1) in list(zip(resampled.points('tuples'), expected.points('tuples')))[edge:-edge]: 
+        assert x0 == x1
+        assert abs(y0 - y1) < tolerance
+
+
+def test_waveform_resample_memory_is_bounded_by_block_size(): 
+
+    import tracemalloc 
+    wf = WaveFactory().create(44100, 440.0, 2.0, 1.0, Sine(compact=True, precision=None))
+    tracemalloc.start()
+    try: 
+        resampled = wf.resample(8000)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally: 
+        tracemalloc.stop()
+    # the output is 128 kB and a block of 65536 weights with its gathered samples is about 2 MB
+    assert len(resampled) == 16000
+    assert peak < 8 * 1024 * 1024
+
+
+def test_waveform_resample_removes_aliases(): 
+
+    wf = WaveFactory().create(8000, 3300.0, 0.5, 1.0, Sine(compact=True))
+
+    sinc = [y for _, y in wf.resample(1000).points('tuples')][100:-100]
+    linear = [y for _, y in wf.resample(1000, 'linear').points('tuples')][100:-100]
+    assert max(map(abs, sinc)) < 0.01
+    assert max(map(abs, linear)) > 0.5
+
+    with pytest.raises(ValueError): 
+        Waveform([]).resample(10)
+    with pytest.raises(ValueError): 
+        wf.resample(1000, 'cubic')
+
+
+def test_osc_pipe_applies_envelope_and_amplitude_modulation(no_numpy): 
+
+    env = ADSR(0.1, 0.1, 0.5, 0.2)
+    assert [env.level(t, 1.0) for t in (0.0, 0.05, 0.1, 0.15, 0.5, 0.8, 0.9, 1.0)] == \
+        pytest.approx([0.0, 0.5, 1.0, 0.75, 0.5, 0.5, 0.25, 0.0])
+    assert ADSR(0.2, 0.1, 0.5, 0.1, gate=0.1).level(0.15, 1.0) == pytest.approx(0.25)
+
+    sine = Sine(sr=100)
+    enveloped = sine.pipe(env)
+    assert enveloped is not sine and sine._stages == ()
+    shaped = [p.y for p in enveloped.calc(2.0)]
+    assert shaped == pytest.approx([math.sin(4 * math.pi * t) * env.level(t, 1.0) for t in (i / 100 for i in range(100))], abs=1e-5)
+
+    tremolo = Sine(sr=100, compact=True).pipe(AmplitudeModulation(Sine(), 1.0, 1.0))
+    y = tremolo.calc(10.0).y
+    assert isinstance(y, array.array)
+    assert max(map(abs, y)) <= 1.0
+    assert y[75] == 0.0 # the modulator is at -1 a quarter cycle before its end
+    unmodulated = Sine().pipe(AmplitudeModulation(Sine(), 3.0, 0.0))
+    assert [p.y for p in unmodulated.calc(5.0, 0.1)] == [p.y for p in Sine().calc(5.0, 0.1)]
+
+    with pytest.raises(ValueError): 
+        ADSR(sustain=2.0)
+    with pytest.raises(ValueError): 
+        AmplitudeModulation(Sine(), 1.0, depth=-0.5)
+
+
+def test_osc_pipe_frequency_modulation_accumulates_phase(no_numpy): 
+
+    fm = Sine(sr=1000).pipe(FrequencyModulation(Sine(), 2.0, 30.0))
+    y = [p.y for p in fm.calc(50.0)]
+
+    # the analytic phase of a sine modulator is 50 t + 30 (1 - cos(4 pi t)) / (4 pi), the 
+    # accumulator runs up to half a sample of deviation behind it: 2 pi * 30 / 2000 radians
+    expected = [math.sin(2 * math.pi * (50 * t + 30 * (1 - math.cos(4 * math.pi * t)) / (4 * math.pi))) 
+        for t in (i / 1000 for i in range(1000))]
+    assert max(abs(a - b) for a, b in zip(y, expected)) < 0.1
+
+    chunks = [p.y for chunk in fm.stream(50.0, chunk_size=64) for p in chunk]
+    assert chunks == y
+    # a block that does not follow the previous one sums the modulator from the start
+    block = fm._generate(fm._sampling_range(600, 900), 50.0, 1.0, 1.0)
+    assert [round(y_i, 5) for y_i in block] == y[600:900]
+
+    unmodulated = Sawtooth(sr=1000).pipe(FrequencyModulation(Sine(), 2.0, 0.0))
+    assert [p.y for p in unmodulated.calc(50.0)] == [p.y for p in Sawtooth(sr=1000).calc(50.0)]
+
+    chained = Sine(sr=1000).pipe(FrequencyModulation(Sine(), 2.0, 30.0), ADSR(), AmplitudeModulation(Triangle(), 4.0))
+    assert [p.y for chunk in chained.stream(50.0, amp=2.0, chunk_size=100) for p in chunk] == \
+        [p.y for p in chained.calc(50.0, amp=2.0)]
+    assert chained._cache_key() != fm._cache_key() != Sine(sr=1000)._cache_key()
+
+
+def test_osc_pipe_frequency_modulation_streams_interleave(mocker): 
+
+    fm = Sine(sr=1000).pipe(FrequencyModulation(Sine(), 2.0, 30.0))
+    expected = [p.y for p in fm.calc(50.0, 5.0)]
+    first, second = fm.stream(50.0, 5.0, chunk_size=100), copy.copy(fm).stream(50.0, 5.0, chunk_size=100)
+    ys = [[p.y for p in next(first)], []]
+    modulator = mocker.spy(fm._stages[0]._modulator, '_generate_waveform')
+    for a, b in zip(first, second): 
+        ys[0].extend(p.y for p in a)
+        ys[1].extend(p.y for p in b)
+    ys[1].extend(p.y for chunk in second for p in chunk)
+
+    assert ys == [expected, expected]
+    # one modulator block per chunk, no stream went back to sum the modulator from the start
+    assert modulator.call_count == 2 * 50 - 1
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_osc_precision_rounds_or_skips_rounding(mocker, no_numpy, compact): 
+
+    full = Sine(sr=100, compact=compact, precision=None).calc(3.0)
+    rounded = Sine(sr=100, compact=compact, precision=2).calc(3.0)
+    default = Sine(sr=100, compact=compact).calc(3.0)
+
+    full_y, rounded_y = [p.y for p in full], [p.y for p in rounded]
+    assert full_y[1] == math.sin(2 * math.pi * 3.0 * 0.01)
+    assert rounded_y == [round(y, 2) for y in full_y]
+    assert [p.y for p in default] == [round(y, 5) for y in full_y]
+    if compact: 
+        assert isinstance(rounded.y, array.array)
+
+    round_spy = mocker.spy(Sine, '_round_samples')
+    Sine(sr=100, compact=compact, precision=None).calc()
+    assert round_spy.call_count == 0
+    assert Square(precision=None)._cache_key() != Square()._cache_key()
+
+    with pytest.raises(ValueError): 
+        Sine(precision=-1)
+
+
+@pytest.mark.parametrize('precision', [0, 2, 5, 9])
+def test_osc_precision_rounds_like_round_with_numpy(precision): 
+
+    rng = random.Random(precision)
+    y = [round(rng.uniform(-1, 1), precision + 1) + rng.choice([0.0, 5 * 10.0 ** -(precision + 1)]) for _ in range(20000)]
+    y += [2.675, -2.675, 0.5, 1.5, -0.5, 0.802855, float('inf'), float('-inf')]
+
+    rounded = Sine(precision=precision)._round_samples(y)
+    assert rounded == [round(y_i, precision) for y_i in y]
+    assert [math.copysign(1.0, r) for r in rounded] == [math.copysign(1.0, round(y_i, precision)) for y_i in y]
+    assert Sine(compact=True, precision=precision)._round_samples(y).tolist() == rounded
+
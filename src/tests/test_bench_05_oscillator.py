@@ -0,0 +1,63 @@
+import json 
+
+import pytest 
+
+from module_one.benchmarks.bench_05_oscillator import STAGES, build_case, run, compare, main, _run_isolated
+import module_one.benchmarks.bench_05_oscillator
+
+
+def test_benchmark_runs_every_stage(): 
+
+    report = run(sample_rates=(100,), durations=(0.5, 1.0), repeat=1, isolate=False)
+
+    assert len(report['results']) == 20
+    for record in report['results']: 
+        assert record['samples'] == int(record['sr'] * record['dur'])
+        assert record['seconds'] >= 0
+        assert record['peak_alloc_bytes'] >= 0
+        assert record['rss_increase_kb'] is None or record['rss_increase_kb'] >= 0
+
+    speedups = compare(report, report)
+    assert len(speedups) == 20
+    assert all(row['speedup'] == 1.0 for row in speedups)
+
+
+def test_benchmark_builds_only_the_inputs_of_the_case(mocker): 
+
+    waveform = mocker.spy(module_one.benchmarks.bench_05_oscillator, 'Waveform')
+    generate = mocker.spy(module_one.benchmarks.bench_05_oscillator.Sine, '_generate_waveform')
+    for stage in ('sampling_index', 'create', 'generate_sine'): 
+        build_case(stage, 100, 1.0)
+    assert generate.call_count == 0
+    build_case('make_points', 100, 1.0)
+    assert (generate.call_count, waveform.call_count) == (1, 0)
+    assert len(build_case('points_tuples', 100, 1.0)()) == 100
+    assert waveform.call_count == 1
+
+    assert len(STAGES) == 10
+    with pytest.raises(ValueError): 
+        build_case('unknown', 100, 1.0)
+
+
+def test_benchmark_reports_the_rss_of_each_case(): 
+
+    large = _run_isolated('create', 44100, 5.0, 1, False)
+    small = _run_isolated('create', 100, 0.1, 1, False)
+    if large['max_rss_kb'] is None: 
+        pytest.skip('resource is not available')
+
+    assert large['rss_increase_kb'] > 0
+    # a small case run after a large one no longer reports the peak of the large one
+    assert small['max_rss_kb'] < large['max_rss_kb']
+    assert small['rss_increase_kb'] < large['rss_increase_kb']
+
+
+def test_benchmark_writes_json(tmp_path): 
+
+    fp = tmp_path / 'bench.json'
+    main(['--srs', '100', '--durations', '0.1', '--repeat', '1', '--compact', '--no-isolate', '--out', str(fp)])
+
+    report = json.loads(fp.read_text())
+    assert report['meta']['compact'] is True 
+    assert report['meta']['isolate'] is False 
+    assert {r['stage'] for r in report['results']} >= {'create', 'make_points', 'points_records'}